@@ -2,3 +2,17 @@ import os
 
 class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv('SQLALCHEMY_URL', 'sqlite:///gamedb.db')
+    SQLALCHEMY_ECHO = os.getenv('SQLALCHEMY_ECHO', 'true').lower() == 'true'
+    # Profiles are captured for requests sent with an X-Profile header, plus this fraction of all requests
+    PROFILE_DIR = os.getenv('PROFILE_DIR', 'profiles')
+    PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', '0'))
+    PROFILE_MAX_STORED = int(os.getenv('PROFILE_MAX_STORED', '50'))
+    # Worker processes for batch position analysis; 0 analyses in the request thread
+    ANALYSIS_WORKERS = int(os.getenv('ANALYSIS_WORKERS', str(os.cpu_count() or 1)))
+    # Finished games older than RETENTION_DAYS are archived and purged; 0 keeps everything
+    RETENTION_DAYS = float(os.getenv('RETENTION_DAYS', '0'))
+    RETENTION_INTERVAL_HOURS = float(os.getenv('RETENTION_INTERVAL_HOURS', '24'))
+    RETENTION_BATCH_SIZE = int(os.getenv('RETENTION_BATCH_SIZE', '200'))
+    RETENTION_VACUUM = os.getenv('RETENTION_VACUUM', 'true').lower() == 'true'
+    # Purged games are appended to JSON lines files here; empty deletes them without a copy
+    ARCHIVE_DIR = os.getenv('ARCHIVE_DIR', 'archive')
@@ -1,20 +1,36 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI
 from fastapi.responses import RedirectResponse
 
-from src.db.dbinit import create_db_and_tables
+from config import Config
+from src.db.dbinit import create_db_and_tables, engine
+from src.db.migrations import migrate_database
+from src.db.retention import retention_loop
+from src.monitoring import install_sql_listeners, monitor_request
+from src.utils.analysis import shutdown_analysis_pool
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    migrate_database()
     create_db_and_tables()
+    retention = asyncio.create_task(retention_loop()) if Config.RETENTION_DAYS > 0 else None
     yield
+    if retention is not None:
+        retention.cancel()
+        with suppress(asyncio.CancelledError):
+            await retention
+    shutdown_analysis_pool()
 
 app = FastAPI(
     title="LidwellPdcaFinalProject",
     lifespan=lifespan,
 )
 
+install_sql_listeners(engine)
+app.middleware('http')(monitor_request)
+
 @app.get("/", include_in_schema=False)
 async def root():
     return RedirectResponse('/docs')
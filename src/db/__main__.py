@@ -0,0 +1,49 @@
+import argparse
+
+from config import Config
+from src.db.dbinit import create_db_and_tables
+from src.db.migrations import migrate_database
+from src.db.positions import backfill_positions
+from src.db.retention import enable_incremental_vacuum, incremental_vacuum, purge_finished_games
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m src.db', description='Database maintenance tasks.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('migrate', help='Upgrade and create the tables for the current schema.')
+    backfill = commands.add_parser('backfill-positions', help='Rebuild the position index from stored moves.')
+    backfill.add_argument('--batch-size', type=int, default=500)
+    purge = commands.add_parser('purge', help='Archive and delete finished games older than --days.')
+    purge.add_argument('--days', type=float, default=Config.RETENTION_DAYS)
+    purge.add_argument('--batch-size', type=int, default=Config.RETENTION_BATCH_SIZE)
+    purge.add_argument('--archive-dir', default=Config.ARCHIVE_DIR, help='Empty to delete without archiving.')
+    purge.add_argument('--vacuum', action='store_true', help='Free the purged pages afterwards.')
+    vacuum = commands.add_parser('vacuum', help='Return free pages to the filesystem.')
+    vacuum.add_argument(
+        '--enable', action='store_true',
+        help='Switch an existing SQLite file to incremental auto_vacuum first (one full VACUUM).',
+    )
+
+    args = parser.parse_args()
+    if args.command == 'purge' and args.days <= 0:
+        parser.error('purge needs --days greater than 0 (or RETENTION_DAYS)')
+    migrate_database()
+    create_db_and_tables()
+    if args.command == 'backfill-positions':
+        print(f"Indexed {backfill_positions(args.batch_size)} positions.")
+    elif args.command == 'purge':
+        purged = purge_finished_games(args.days, args.batch_size, args.archive_dir)
+        print(f"Purged {purged} finished games older than {args.days} days.")
+        if args.vacuum and not incremental_vacuum():
+            print("Skipped vacuum: the database is not in incremental auto_vacuum mode.")
+    elif args.command == 'vacuum':
+        if args.enable:
+            enable_incremental_vacuum()
+        if incremental_vacuum():
+            print("Vacuumed.")
+        else:
+            print("Skipped vacuum: the database is not in incremental auto_vacuum mode.")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,14 @@
 from datetime import datetime, UTC
 from uuid import uuid4
 
-from sqlalchemy import Column, String, DateTime, ForeignKey, Enum, Integer, create_engine
+from sqlalchemy import (
+    BigInteger, Column, String, DateTime, ForeignKey, Enum, Index, Integer, SmallInteger, create_engine,
+)
 from sqlalchemy.orm import DeclarativeBase, relationship, sessionmaker
 
 from config import Config
+from src.utils.mnk import VARIANTS
+from src.views.game.create_game import GameType
 
 class Base(DeclarativeBase):
     """Base class for declarative models"""
@@ -13,12 +17,15 @@ class Base(DeclarativeBase):
 class Game(Base):
     __tablename__ = 'games'
 
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid4()), unique=True, nullable=False)
-    createdat = Column(DateTime, default=datetime.now(UTC), nullable=False)
+    # Integer key used by moves; the UUID id stays the public identifier
+    key = Column(Integer, primary_key=True, autoincrement=True)
+    id = Column(String(36), default=lambda: str(uuid4()), unique=True, nullable=False)
+    createdat = Column(DateTime, default=lambda: datetime.now(UTC), nullable=False)
     winner = Column(Enum('X', 'O', 'Tie', name='game_winner'), nullable=True)
-    game_type = Column(Enum('TicTacToe', 'Connect4', name='game_type'), nullable=False)
+    game_type = Column(Enum('TicTacToe', 'Connect4', 'Gomoku', 'Connect4Large', name='game_type'), nullable=False)
 
-    moves = relationship('Move', back_populates='game', cascade='all, delete-orphan')
+    moves = relationship('Move', back_populates='game', cascade='all, delete-orphan', order_by='Move.ply')
+    positions = relationship('GamePosition', cascade='all, delete-orphan')
 
     def __repr__(self):
         return f"<Game(id='{self.id}', createdat='{self.createdat}', game_type='{self.game_type}')>"
@@ -26,18 +33,53 @@ class Game(Base):
 
 class Move(Base):
     __tablename__ = 'moves'
+    # Rows are clustered on (game_key, ply), so a game's moves in order are one range scan
+    __table_args__ = {'sqlite_with_rowid': False}
 
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid4()), unique=True, nullable=False)
-    game_id = Column(String(36), ForeignKey('games.id'), nullable=False)
+    game_key = Column(Integer, ForeignKey('games.key'), primary_key=True)
+    ply = Column(SmallInteger, primary_key=True)
+    cell = Column(SmallInteger, nullable=False)
     player = Column(Enum('X', 'O', name='player_move'), nullable=False)
-    row = Column(Integer, nullable=False)
-    col = Column(Integer, nullable=False)
-    timestamp = Column(DateTime, default=datetime.now(UTC), nullable=False)
+    timestamp = Column(DateTime, default=lambda: datetime.now(UTC), nullable=False)
 
     game = relationship('Game', back_populates='moves')
-    
-engine = create_engine(Config.SQLALCHEMY_DATABASE_URI, echo=True)
+
+    @property
+    def game_id(self) -> str:
+        return self.game.id
+
+    @property
+    def row(self) -> int:
+        return self.cell // self._cols
+
+    @property
+    def col(self) -> int:
+        return self.cell % self._cols
+
+    @property
+    def _cols(self) -> int:
+        return VARIANTS[GameType(self.game.game_type)].cols
+
+
+class GamePosition(Base):
+    """Canonical hash of the position after each ply, for finding games that reached a position."""
+    __tablename__ = 'game_positions'
+    __table_args__ = (
+        Index('ix_game_positions_game_key', 'game_key'),
+        {'sqlite_with_rowid': False},
+    )
+
+    position_hash = Column(BigInteger, primary_key=True)
+    game_key = Column(Integer, ForeignKey('games.key'), primary_key=True)
+    ply = Column(SmallInteger, primary_key=True)
+
+engine = create_engine(Config.SQLALCHEMY_DATABASE_URI, echo=Config.SQLALCHEMY_ECHO)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     
 def create_db_and_tables():
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    with engine.connect() as conn:
+        # auto_vacuum can only be switched without a full VACUUM before the first table exists
+        if engine.dialect.name == 'sqlite' and not conn.exec_driver_sql('SELECT 1 FROM sqlite_master').first():
+            conn.exec_driver_sql('PRAGMA auto_vacuum = INCREMENTAL')
+        Base.metadata.create_all(bind=conn)
+        conn.commit()
\ No newline at end of file
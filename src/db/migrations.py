@@ -0,0 +1,102 @@
+"""
+Upgrades databases created before moves were keyed by (game_key, ply).
+
+Runs automatically from the app lifespan, or by hand with `python -m src.db migrate`.
+"""
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+
+from src.db.dbinit import Game, GamePosition, Move, engine
+from src.db.positions import backfill_positions
+from src.utils.mnk import VARIANTS
+
+
+def migrate_to_compact_moves(bind: Engine) -> bool:
+    """
+    Rebuild the legacy games/moves tables (UUID move ids, separate row and col) into the compact schema.
+
+    Move order is taken from insertion order, since the legacy timestamps were all the same value.
+    Everything runs in one explicit transaction, because pysqlite would otherwise commit the renames and
+    creates on its own. Leftover games_legacy/moves_legacy tables from an interrupted run are resumed:
+    legacy games missing from the new tables are copied over and games created since are kept.
+    Returns whether a migration was needed.
+    """
+    inspector = inspect(bind)
+    tables = set(inspector.get_table_names())
+    legacy_games = 'games_legacy' if 'games_legacy' in tables else None
+    if legacy_games is None and 'games' in tables:
+        if 'key' not in {column['name'] for column in inspector.get_columns('games')}:
+            legacy_games = 'games'
+    legacy_moves = 'moves_legacy' if 'moves_legacy' in tables else None
+    if legacy_moves is None and 'moves' in tables:
+        if 'ply' not in {column['name'] for column in inspector.get_columns('moves')}:
+            legacy_moves = 'moves'
+    if legacy_games is None and legacy_moves is None:
+        return False
+    if legacy_games is None:
+        raise RuntimeError(f"Found legacy table {legacy_moves} without the legacy games table it belongs to")
+
+    with bind.connect() as conn:
+        unknown = conn.exec_driver_sql(
+            f'SELECT DISTINCT game_type FROM {legacy_games} WHERE game_type NOT IN '
+            f"({', '.join(repr(game_type.value) for game_type in VARIANTS)})"
+        ).scalars().all()
+    if unknown:
+        raise RuntimeError(f"Cannot migrate games of unknown type: {', '.join(map(str, unknown))}")
+
+    cols_by_type = ' '.join(
+        f"WHEN '{game_type.value}' THEN {variant.cols}" for game_type, variant in VARIANTS.items()
+    )
+    with bind.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+        conn.exec_driver_sql('BEGIN IMMEDIATE')
+        try:
+            if legacy_moves == 'moves':
+                conn.exec_driver_sql('ALTER TABLE moves RENAME TO moves_legacy')
+            if legacy_games == 'games':
+                conn.exec_driver_sql('ALTER TABLE games RENAME TO games_legacy')
+            Game.__table__.create(conn, checkfirst=True)
+            Move.__table__.create(conn, checkfirst=True)
+
+            conn.exec_driver_sql(
+                'INSERT INTO games (id, createdat, winner, game_type) '
+                'SELECT id, createdat, winner, game_type FROM games_legacy '
+                'WHERE id NOT IN (SELECT id FROM games) ORDER BY rowid'
+            )
+            if legacy_moves is not None:
+                conn.exec_driver_sql(
+                    'INSERT INTO moves (game_key, ply, cell, player, timestamp) '
+                    'SELECT games.key, '
+                    '       ROW_NUMBER() OVER (PARTITION BY moves_legacy.game_id ORDER BY moves_legacy.rowid) - 1, '
+                    f'      moves_legacy."row" * CASE games.game_type {cols_by_type} END + moves_legacy.col, '
+                    '       moves_legacy.player, moves_legacy.timestamp '
+                    'FROM moves_legacy JOIN games ON games.id = moves_legacy.game_id '
+                    'WHERE NOT EXISTS (SELECT 1 FROM moves WHERE moves.game_key = games.key)'
+                )
+                conn.exec_driver_sql('DROP TABLE moves_legacy')
+            conn.exec_driver_sql('DROP TABLE games_legacy')
+            conn.exec_driver_sql('COMMIT')
+        except BaseException:
+            conn.exec_driver_sql('ROLLBACK')
+            raise
+    return True
+
+
+def needs_position_backfill(bind: Engine) -> bool:
+    """Whether stored moves exist but the position index is missing or empty, e.g. on a database from before it."""
+    tables = set(inspect(bind).get_table_names())
+    if 'moves' not in tables:
+        return False
+    with bind.connect() as conn:
+        if conn.exec_driver_sql('SELECT 1 FROM moves LIMIT 1').first() is None:
+            return False
+        if 'game_positions' not in tables:
+            return True
+        return conn.exec_driver_sql('SELECT 1 FROM game_positions LIMIT 1').first() is None
+
+
+def migrate_database():
+    if migrate_to_compact_moves(engine):
+        print("Migrated games and moves to the compact schema.")
+    if needs_position_backfill(engine):
+        GamePosition.__table__.create(engine, checkfirst=True)
+        print(f"Indexed {backfill_positions()} positions.")
@@ -0,0 +1,56 @@
+from itertools import groupby
+
+from sqlalchemy import insert
+
+from src.db.dbinit import Game, GamePosition, Move, SessionLocal
+from src.utils.positions import position_hashes
+from src.views.game.create_game import GameType
+
+
+def backfill_positions(batch_size: int = 500) -> int:
+    """
+    Rebuild the position index from the stored moves of every game.
+
+    Each batch of games is replaced in its own short transaction, so the job can be rerun or
+    interrupted safely. Returns the number of positions written.
+    """
+    written = 0
+    last_key = 0
+    while True:
+        with SessionLocal() as db:
+            games = (
+                db.query(Game.key, Game.game_type)
+                .filter(Game.key > last_key)
+                .order_by(Game.key)
+                .limit(batch_size)
+                .all()
+            )
+            if not games:
+                return written
+
+            game_types = dict(games)
+            moves = (
+                db.query(Move.game_key, Move.ply, Move.cell, Move.player)
+                .filter(Move.game_key.in_(game_types))
+                .order_by(Move.game_key, Move.ply)
+                .all()
+            )
+
+            rows = []
+            for game_key, game_moves in groupby(moves, key=lambda move: move.game_key):
+                game_moves = list(game_moves)
+                hashes = position_hashes(
+                    GameType(game_types[game_key]), [(move.cell, move.player) for move in game_moves]
+                )
+                rows += [
+                    {'position_hash': h, 'game_key': game_key, 'ply': move.ply}
+                    for h, move in zip(hashes, game_moves)
+                ]
+
+            db.query(GamePosition).filter(GamePosition.game_key.in_(game_types)).delete(synchronize_session=False)
+            if rows:
+                db.execute(insert(GamePosition), rows)
+            db.commit()
+
+            written += len(rows)
+            last_key = games[-1].key
@@ -0,0 +1,163 @@
+"""
+Set-based game deletion and the retention job that archives and purges old finished games.
+
+The job runs from the app lifespan when RETENTION_DAYS is set, or by hand with `python -m src.db purge`.
+"""
+import asyncio
+import json
+import logging
+import os
+from datetime import UTC, datetime, timedelta
+from itertools import groupby
+from typing import List, Optional, Sequence
+
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from config import Config
+from src.db.dbinit import Game, GamePosition, Move, SessionLocal, engine
+
+logger = logging.getLogger(__name__)
+
+# SQLite auto_vacuum mode that frees pages only when asked with PRAGMA incremental_vacuum
+AUTO_VACUUM_INCREMENTAL = 2
+
+
+def delete_games(db: Session, game_keys: Sequence[int]) -> int:
+    """
+    Delete games with their moves and positions, one DELETE per table, without loading any rows.
+
+    Children go first so it works whether or not the database enforces foreign keys. The caller commits.
+    Returns the number of games deleted.
+    """
+    if not game_keys:
+        return 0
+    db.execute(
+        delete(GamePosition).where(GamePosition.game_key.in_(game_keys)),
+        execution_options={'synchronize_session': False},
+    )
+    db.execute(
+        delete(Move).where(Move.game_key.in_(game_keys)),
+        execution_options={'synchronize_session': False},
+    )
+    return db.execute(
+        delete(Game).where(Game.key.in_(game_keys)),
+        execution_options={'synchronize_session': False},
+    ).rowcount
+
+
+def _archive_games(db: Session, games: List[Game], archive_path: str):
+    """Append each game and its (cell, player) moves to a JSON lines file, flushed to disk."""
+    moves = (
+        db.query(Move.game_key, Move.cell, Move.player)
+        .filter(Move.game_key.in_([game.key for game in games]))
+        .order_by(Move.game_key, Move.ply)
+        .all()
+    )
+    moves_by_game = {
+        game_key: [[move.cell, move.player] for move in game_moves]
+        for game_key, game_moves in groupby(moves, key=lambda move: move.game_key)
+    }
+
+    os.makedirs(os.path.dirname(archive_path) or '.', exist_ok=True)
+    with open(archive_path, 'a', encoding='utf-8') as archive:
+        for game in games:
+            archive.write(json.dumps({
+                'id': game.id,
+                'game_type': game.game_type,
+                'createdat': game.createdat.isoformat(),
+                'winner': game.winner,
+                'moves': moves_by_game.get(game.key, []),
+            }) + '\n')
+        archive.flush()
+        os.fsync(archive.fileno())
+
+
+def purge_finished_games(
+        max_age_days: float = Config.RETENTION_DAYS,
+        batch_size: int = Config.RETENTION_BATCH_SIZE,
+        archive_dir: Optional[str] = Config.ARCHIVE_DIR,
+) -> int:
+    """
+    Archive, then delete, finished games created more than max_age_days ago.
+
+    Batches walk the games by key, like backfill_positions, so old unfinished games are scanned once
+    rather than again by every batch. Each batch is its own short transaction, so other writers only
+    wait for one batch at a time.
+    A game whose batch fails after archiving is archived again by the next run. With no archive_dir
+    games are deleted without a copy. Returns the number of games purged.
+    """
+    cutoff = datetime.now(UTC) - timedelta(days=max_age_days)
+    archive_path = None
+    if archive_dir:
+        archive_path = os.path.join(archive_dir, f"games-{datetime.now(UTC):%Y-%m-%d}.jsonl")
+
+    purged = 0
+    last_key = 0
+    while True:
+        with SessionLocal() as db:
+            games = (
+                db.query(Game)
+                .filter(Game.key > last_key, Game.winner.is_not(None), Game.createdat < cutoff)
+                .order_by(Game.key)
+                .limit(batch_size)
+                .all()
+            )
+            if not games:
+                return purged
+
+            if archive_path:
+                _archive_games(db, games, archive_path)
+            last_key = games[-1].key
+            purged += delete_games(db, [game.key for game in games])
+            db.commit()
+
+
+def incremental_vacuum(pages: int = 0) -> bool:
+    """
+    Return free pages to the filesystem, all of them when pages is 0.
+
+    Only SQLite databases in incremental auto_vacuum mode support this, see enable_incremental_vacuum.
+    Returns whether anything ran.
+    """
+    if engine.dialect.name != 'sqlite':
+        return False
+    with engine.connect() as conn:
+        if conn.exec_driver_sql('PRAGMA auto_vacuum').scalar() != AUTO_VACUUM_INCREMENTAL:
+            return False
+        # executescript steps the pragma to completion; execute would free a single page
+        conn.connection.driver_connection.executescript(f'PRAGMA incremental_vacuum({int(pages)})')
+    return True
+
+
+def enable_incremental_vacuum():
+    """Switch a SQLite database to incremental auto_vacuum, which needs one full VACUUM to rebuild the file."""
+    if engine.dialect.name != 'sqlite':
+        return
+    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+        conn.exec_driver_sql(f'PRAGMA auto_vacuum = {AUTO_VACUUM_INCREMENTAL}')
+        conn.exec_driver_sql('VACUUM')
+
+
+def run_retention() -> int:
+    purged = purge_finished_games()
+    if purged and Config.RETENTION_VACUUM:
+        incremental_vacuum()
+    return purged
+
+
+async def retention_loop(interval_hours: float = Config.RETENTION_INTERVAL_HOURS):
+    """
+    Run the retention job off the event loop now and then every interval_hours, until cancelled.
+
+    A failed run (unwritable archive, locked database, full disk) is logged and retried next interval.
+    """
+    while True:
+        try:
+            purged = await asyncio.to_thread(run_retention)
+        except Exception:
+            logger.exception("Retention run failed; retrying in %s hours", interval_hours)
+        else:
+            if purged:
+                logger.info("Purged %s finished games older than %s days", purged, Config.RETENTION_DAYS)
+        await asyncio.sleep(interval_hours * 3600)
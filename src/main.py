@@ -1,11 +1,14 @@
 import uvicorn
 
 from src import app
-from src.routers import default_router, game_router, move_router
+from src.routers import analysis_router, default_router, game_router, metrics_router, move_router, position_router
 
 app.include_router(default_router)
 app.include_router(game_router)
 app.include_router(move_router)
+app.include_router(position_router)
+app.include_router(analysis_router)
+app.include_router(metrics_router)
 
 if __name__ == '__main__':
     uvicorn.run('src.main:app', host='0.0.0.0', port=8000)
\ No newline at end of file
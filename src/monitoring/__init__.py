@@ -0,0 +1,3 @@
+from .metrics import install_sql_listeners, registry
+from .middleware import monitor_request
+from .profiling import profiles
\ No newline at end of file
@@ -0,0 +1,122 @@
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class RequestStats:
+    def __init__(self):
+        self.sql_statements = 0
+        self.sql_seconds = 0.0
+
+
+# Set by the middleware for the duration of a request. The object is shared with the threadpool
+# the sync endpoints run in, so SQL listeners on any thread add to the right request.
+current_request_stats: ContextVar[Optional[RequestStats]] = ContextVar('current_request_stats', default=None)
+
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        index = bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+
+class HistogramFamily:
+    def __init__(self, name: str, description: str, label_names: Tuple[str, ...], buckets: Sequence[float]):
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self.buckets = buckets
+        self.histograms: Dict[Tuple[str, ...], Histogram] = {}
+
+    def observe(self, labels: Tuple[str, ...], value: float):
+        histogram = self.histograms.get(labels)
+        if histogram is None:
+            histogram = self.histograms[labels] = Histogram(self.buckets)
+        histogram.observe(value)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        for labels, histogram in sorted(self.histograms.items()):
+            label_text = ','.join(
+                f'{name}="{_escape(value)}"' for name, value in zip(self.label_names, labels)
+            )
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{label_text},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{label_text},le="+Inf"}} {histogram.count}')
+            lines.append(f'{self.name}_sum{{{label_text}}} {histogram.sum}')
+            lines.append(f'{self.name}_count{{{label_text}}} {histogram.count}')
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.request_duration = HistogramFamily(
+            'http_request_duration_seconds', 'Time spent handling a request.',
+            ('method', 'route', 'status'), LATENCY_BUCKETS,
+        )
+        self.sql_statements = HistogramFamily(
+            'http_request_sql_statements', 'SQL statements executed per request.',
+            ('method', 'route'), STATEMENT_BUCKETS,
+        )
+        self.sql_duration = HistogramFamily(
+            'http_request_sql_duration_seconds', 'Time spent executing SQL per request.',
+            ('method', 'route'), LATENCY_BUCKETS,
+        )
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float, stats: RequestStats):
+        with self._lock:
+            self.request_duration.observe((method, route, str(status)), seconds)
+            self.sql_statements.observe((method, route), stats.sql_statements)
+            self.sql_duration.observe((method, route), stats.sql_seconds)
+
+    def render(self) -> str:
+        with self._lock:
+            families = (self.request_duration, self.sql_statements, self.sql_duration)
+            return '\n'.join(line for family in families for line in family.render()) + '\n'
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def install_sql_listeners(engine: Engine):
+    @event.listens_for(engine, 'before_cursor_execute')
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_start_times', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info['query_start_times'].pop()
+        stats = current_request_stats.get()
+        if stats is not None:
+            stats.sql_statements += 1
+            stats.sql_seconds += time.perf_counter() - started
+
+    @event.listens_for(engine, 'handle_error')
+    def handle_error(context):
+        # Failed statements never reach after_cursor_execute
+        if context.connection is not None and context.connection.info.get('query_start_times'):
+            context.connection.info['query_start_times'].pop()
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,31 @@
+import time
+
+from fastapi import Request
+
+from .metrics import RequestStats, current_request_stats, registry
+from .profiling import PROFILE_ID_HEADER, profiles
+
+
+async def monitor_request(request: Request, call_next):
+    stats = RequestStats()
+    token = current_request_stats.set(stats)
+    profile = profiles.start(request)
+    start = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+    finally:
+        elapsed = time.perf_counter() - start
+        current_request_stats.reset(token)
+        if profile is not None:
+            profile_id = profiles.finish(profile, request.method, request.url.path, elapsed)
+
+        # Label by route template rather than the raw path to keep the number of series bounded
+        route = request.scope.get('route')
+        route_path = getattr(route, 'path', 'unmatched')
+        registry.observe_request(request.method, route_path, status_code, elapsed, stats)
+
+    if profile is not None:
+        response.headers[PROFILE_ID_HEADER] = profile_id
+    return response
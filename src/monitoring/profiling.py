@@ -0,0 +1,100 @@
+import cProfile
+import json
+import random
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+from uuid import uuid4
+
+from fastapi import Request
+
+from config import Config
+
+PROFILE_HEADER = 'x-profile'
+PROFILE_ID_HEADER = 'X-Profile-Id'
+
+
+class ProfileStore:
+    """
+    Captures cProfile runs of single requests and keeps the newest ones on disk as .prof files.
+
+    Each profile has a .json file with its request details beside it, so the list survives restarts.
+
+    Since Python 3.12 a profiler sees every thread, so the sync endpoints running in the threadpool
+    are included. It also means only one request can be profiled at a time, and anything else the
+    server runs meanwhile shows up in that profile too.
+    """
+
+    def __init__(self, directory: str, max_profiles: int, sample_rate: float):
+        self.directory = Path(directory)
+        self.max_profiles = max_profiles
+        self.sample_rate = sample_rate
+        self._active = threading.Lock()
+        self._lock = threading.Lock()
+        self._profiles: 'OrderedDict[str, Dict]' = OrderedDict()
+        self._load()
+
+    def _load(self):
+        """Pick up the profiles stored by earlier runs, oldest first, and prune them to max_profiles."""
+        if not self.directory.is_dir():
+            return
+        for prof_file in sorted(self.directory.glob('*.prof'), key=lambda file: file.stat().st_mtime):
+            profile_id = prof_file.stem
+            try:
+                details = json.loads(prof_file.with_suffix('.json').read_text())
+            except (OSError, ValueError):
+                details = {'method': None, 'path': None, 'seconds': None}
+            details.update(id=profile_id, captured_at=prof_file.stat().st_mtime)
+            self._profiles[profile_id] = details
+        self._prune()
+
+    def _prune(self):
+        while len(self._profiles) > self.max_profiles:
+            old_id, _ = self._profiles.popitem(last=False)
+            (self.directory / f"{old_id}.prof").unlink(missing_ok=True)
+            (self.directory / f"{old_id}.json").unlink(missing_ok=True)
+
+    def start(self, request: Request) -> Optional[cProfile.Profile]:
+        requested = request.headers.get(PROFILE_HEADER, '').lower() in {'1', 'true', 'yes'}
+        sampled = self.sample_rate > 0 and random.random() < self.sample_rate
+        if not (requested or sampled) or not self._active.acquire(blocking=False):
+            return None
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler (a debugger, or a manual cProfile run) is already attached
+            self._active.release()
+            return None
+        return profile
+
+    def finish(self, profile: cProfile.Profile, method: str, path: str, seconds: float) -> str:
+        profile.disable()
+        self._active.release()
+
+        profile_id = str(uuid4())
+        self.directory.mkdir(parents=True, exist_ok=True)
+        details = {'method': method, 'path': path, 'seconds': seconds}
+        (self.directory / f"{profile_id}.json").write_text(json.dumps(details))
+        profile.dump_stats(self.directory / f"{profile_id}.prof")
+
+        with self._lock:
+            self._profiles[profile_id] = {'id': profile_id, **details, 'captured_at': time.time()}
+            self._prune()
+        return profile_id
+
+    def list(self) -> List[Dict]:
+        with self._lock:
+            return list(reversed(self._profiles.values()))
+
+    def path(self, profile_id: str) -> Optional[Path]:
+        with self._lock:
+            if profile_id not in self._profiles:
+                return None
+        return self.directory / f"{profile_id}.prof"
+
+
+profiles = ProfileStore(Config.PROFILE_DIR, Config.PROFILE_MAX_STORED, Config.PROFILE_SAMPLE_RATE)
@@ -1,3 +1,6 @@
+from .analysis import router as analysis_router
 from .default import router as default_router
 from .game import router as game_router
-from .move import router as move_router
\ No newline at end of file
+from .metrics import router as metrics_router
+from .move import router as move_router
+from .position import router as position_router
@@ -0,0 +1,98 @@
+from fastapi import APIRouter, HTTPException, status
+
+from src.utils.analysis import AnalysisJob, analyze_positions
+from src.utils.mnk import Bitboard, VARIANTS
+from src.utils.mnk.bitboard import line_tables
+from src.utils.positions import is_valid_board
+from src.views.analysis import AnalysisRequest, AnalysisResponse, MoveScore, PositionAnalysis, PositionRequest
+from src.views.game.create_game import GameType
+from src.views.move.position import Position
+
+router = APIRouter(tags=['Analysis'])
+
+def _has_line(game_type: GameType, board: str, player: str) -> bool:
+    stones = sum(1 << cell for cell, mark in enumerate(board) if mark == player)
+    return any(stones & window == window for window in line_tables(VARIANTS[game_type]).windows)
+
+def _is_reachable(game_type: GameType, board: str) -> bool:
+    # X moves first, and with gravity every stone rests on the bottom or another stone
+    x_stones, o_stones = board.count('X'), board.count('O')
+    if x_stones - o_stones not in (0, 1):
+        return False
+    variant = VARIANTS[game_type]
+    if variant.gravity:
+        for col in range(variant.cols):
+            column = board[col::variant.cols]
+            if '.' in column.lstrip('.'):
+                return False
+
+    # Play stops at the first line, so only the player who moved last can have one
+    x_wins, o_wins = _has_line(game_type, board, 'X'), _has_line(game_type, board, 'O')
+    if x_wins and (o_wins or x_stones == o_stones):
+        return False
+    if o_wins and x_stones != o_stones:
+        return False
+    return True
+
+def _board_key(index: int, position: PositionRequest) -> str:
+    if position.board is not None:
+        if not is_valid_board(position.game_type, position.board):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Position {index}: board does not match the game type"
+            )
+        if not _is_reachable(position.game_type, position.board):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Position {index}: board cannot arise in play"
+            )
+        return position.board
+
+    variant = VARIANTS[position.game_type]
+    board = Bitboard(variant)
+    for move in position.moves:
+        in_bounds = 0 <= move.row < variant.rows and 0 <= move.col < variant.cols
+        cell = move.row * variant.cols + move.col
+        if board.is_over() or not in_bounds or not board.is_legal(cell):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Position {index}: illegal move at row {move.row}, col {move.col}"
+            )
+        board.play(cell)
+    return board.key()
+
+@router.post(
+    '/analysis',
+    response_model=AnalysisResponse,
+    status_code=status.HTTP_200_OK,
+    description='Best move, the score of every candidate move and the principal variation for a batch of positions.',
+)
+def analyze(request: AnalysisRequest):
+    jobs = [
+        AnalysisJob(position.game_type, _board_key(index, position), position.max_depth, position.time_limit)
+        for index, position in enumerate(request.positions)
+    ]
+    analyses = analyze_positions(jobs)
+
+    results = []
+    for job, analysis in zip(jobs, analyses):
+        board = Bitboard.from_key(VARIANTS[job.game_type], job.board)
+
+        def position(cell: int) -> Position:
+            row, col = board.coords(cell)
+            return Position(row=row, col=col)
+
+        move_scores = sorted(analysis.move_scores.items(), key=lambda item: -item[1])
+        results.append(PositionAnalysis(
+            game_type=job.game_type,
+            board=job.board,
+            next_player=None if board.is_over() else board.player_to_move,
+            result=board.result(),
+            best_move=position(analysis.best_move) if analysis.best_move is not None else None,
+            score=analysis.score,
+            moves=[MoveScore(**position(cell).model_dump(), score=score) for cell, score in move_scores],
+            principal_variation=[position(cell) for cell in analysis.principal_variation],
+            depth=analysis.depth,
+            nodes=analysis.nodes,
+        ))
+    return AnalysisResponse(results=results)
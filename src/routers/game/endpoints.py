@@ -1,10 +1,18 @@
+from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, status, Depends, HTTPException
+from fastapi import APIRouter, status, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from src.db import get_db
 from src.db.dbinit import Game
+from src.db.retention import delete_games
+from src.routers.responses import FastJSONResponse, accepts_compact, wants_compact
+from src.utils.positions import board_string
+from src.views.game.compact_game import COMPACT_MEDIA_TYPE, GameCompact
+from src.views.game.create_game import GameType
+from src.views.game.delete_games import GamesDeleted
 from src.views.game.read_game import GameRead
 from src.views.game.update_game_winner import UpdateWinnerRequest
 
@@ -15,8 +23,8 @@ router = APIRouter(tags=['Games'])
     response_model=GameRead,
     status_code=status.HTTP_201_CREATED,
 )
-def create_game(game_type: str, db: Session = Depends(get_db)):
-    db_game = Game(game_type=game_type)
+def create_game(game_type: GameType, db: Session = Depends(get_db)):
+    db_game = Game(game_type=game_type.value)
     db.add(db_game)
     db.commit()
     db.refresh(db_game)
@@ -24,15 +32,51 @@ def create_game(game_type: str, db: Session = Depends(get_db)):
 
 
 
+def compact_game(game: Game) -> GameCompact:
+    game_type = GameType(game.game_type)
+    moves = [(move.cell, move.player) for move in game.moves]
+
+    if game.winner is not None:
+        next_player = None
+    elif moves and moves[-1][1] == 'X':
+        next_player = 'O'
+    else:
+        next_player = 'X'
+
+    return GameCompact(
+        id=game.id,
+        game_type=game_type,
+        board=board_string(game_type, moves),
+        moves=[cell for cell, _ in moves],
+        next_player=next_player,
+        result=game.winner,
+    )
+
+
 @router.get(
     '/games/{game_id}',
     response_model=GameRead,
     status_code=status.HTTP_200_OK,
+    description=f"Pass `format=compact` or `Accept: {COMPACT_MEDIA_TYPE}` to get a GameCompact instead.",
 )
-def read_game(game_id: UUID, db: Session = Depends(get_db)):
+def read_game(
+    game_id: UUID,
+    request: Request,
+    response: Response,
+    response_format: Optional[str] = Query(None, alias='format'),
+    db: Session = Depends(get_db),
+):
     game = db.query(Game).filter(Game.id == str(game_id)).first()
     if not game:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Game not found')
+    # The body depends on the Accept header, so caches must not share it between formats
+    response.headers['Vary'] = 'Accept'
+    if wants_compact(request, response_format):
+        return FastJSONResponse(
+            compact_game(game),
+            media_type=COMPACT_MEDIA_TYPE if accepts_compact(request) else None,
+            headers={'Vary': 'Accept'},
+        )
     return game
 
 @router.put(
@@ -55,8 +99,25 @@ def update_game_winner(game_id: UUID, winner_request: UpdateWinnerRequest, db: S
     status_code=status.HTTP_204_NO_CONTENT
 )
 def delete_game(game_id: UUID, db: Session = Depends(get_db)):
-    game = db.query(Game).filter(Game.id == str(game_id)).first()
-    if not game:
+    game_keys = db.scalars(select(Game.key).where(Game.id == str(game_id))).all()
+    if not game_keys:
         raise HTTPException(status_code=404, detail="Game not found")
-    db.delete(game)
-    db.commit()
\ No newline at end of file
+    delete_games(db, game_keys)
+    db.commit()
+
+@router.delete(
+    '/games',
+    response_model=GamesDeleted,
+    status_code=status.HTTP_200_OK,
+    description='Delete several games at once; ids that do not exist are ignored.',
+)
+def delete_games_bulk(
+    game_ids: List[UUID] = Query(..., alias='id', max_length=1000),
+    db: Session = Depends(get_db),
+):
+    game_keys = db.scalars(
+        select(Game.key).where(Game.id.in_([str(game_id) for game_id in game_ids]))
+    ).all()
+    deleted = delete_games(db, game_keys)
+    db.commit()
+    return GamesDeleted(deleted=deleted)
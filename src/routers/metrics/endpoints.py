@@ -0,0 +1,32 @@
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import FileResponse, PlainTextResponse
+
+from src.monitoring import profiles, registry
+
+router = APIRouter(tags=['Monitoring'])
+
+@router.get(
+    '/metrics',
+    response_class=PlainTextResponse,
+    description='Per-route latency and SQL histograms in the Prometheus text format.',
+)
+def read_metrics():
+    return PlainTextResponse(registry.render(), media_type='text/plain; version=0.0.4; charset=utf-8')
+
+@router.get(
+    '/profiles',
+    description='Stored request profiles, newest first. Send a request with `X-Profile: 1` to capture one.',
+)
+def list_profiles():
+    return profiles.list()
+
+@router.get(
+    '/profiles/{profile_id}',
+    response_class=FileResponse,
+    description='Download a profile as a cProfile .prof file (open with pstats or snakeviz).',
+)
+def download_profile(profile_id: str):
+    path = profiles.path(profile_id)
+    if path is None or not path.exists():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Profile not found')
+    return FileResponse(path, media_type='application/octet-stream', filename=f"{profile_id}.prof")
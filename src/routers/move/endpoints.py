@@ -1,10 +1,14 @@
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, contains_eager
 
 from src.db import get_db
-from src.db.dbinit import Game, Move
+from src.db.dbinit import Game, GamePosition, Move
+from src.utils.mnk import VARIANTS
+from src.utils.positions import board_string, position_hash
+from src.views.game.create_game import GameType
 from src.views.move import MoveCreate, MoveRead
 
 router = APIRouter(tags=['Moves'])
@@ -23,15 +27,44 @@ def create_move(game_id: UUID, move: MoveCreate, db: Session = Depends(get_db)):
             detail="Game not found"
         )
 
+    game_type = GameType(db_game.game_type)
+    variant = VARIANTS[game_type]
+    if not (0 <= move.position.row < variant.rows and 0 <= move.position.col < variant.cols):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Position is off the board"
+        )
+
+    # (game_key, ply) is the primary key, so the game's moves in order are a single range scan
+    previous_moves = (
+        db.query(Move.cell, Move.player)
+        .filter(Move.game_key == db_game.key)
+        .order_by(Move.ply)
+        .all()
+    )
+    cell = move.position.row * variant.cols + move.position.col
     db_move = Move(
-        game_id=str(game_id),
+        game=db_game,
+        ply=len(previous_moves),
         player=move.player,
-        row=move.position.row,
-        col=move.position.col,
+        cell=cell,
+    )
+    board = board_string(game_type, [*previous_moves, (cell, move.player)])
+    db_position = GamePosition(
+        position_hash=position_hash(game_type, board),
+        game_key=db_game.key,
+        ply=db_move.ply,
     )
 
-    db.add(db_move)
-    db.commit()
+    db.add_all([db_move, db_position])
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Another move was recorded for this game at the same time"
+        )
     db.refresh(db_move)
 
     return db_move
@@ -42,7 +75,14 @@ def create_move(game_id: UUID, move: MoveCreate, db: Session = Depends(get_db)):
     status_code=status.HTTP_200_OK,
 )
 def read_moves_for_game(game_id: UUID, db: Session = Depends(get_db)):
-    db_moves = db.query(Move).filter(Move.game_id == str(game_id)).all()
+    db_moves = (
+        db.query(Move)
+        .join(Move.game)
+        .options(contains_eager(Move.game))
+        .filter(Game.id == str(game_id))
+        .order_by(Move.ply)
+        .all()
+    )
     if not db_moves:
         db_game = db.query(Game).filter(Game.id == str(game_id)).first()
         if not db_game:
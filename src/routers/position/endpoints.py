@@ -0,0 +1,56 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from src.db import get_db
+from src.db.dbinit import Game, GamePosition
+from src.utils.positions import is_valid_board, position_hash
+from src.views.game.create_game import GameType
+from src.views.position import PositionGame, PositionStats
+
+router = APIRouter(tags=['Positions'])
+
+@router.get(
+    '/positions/{game_type}',
+    response_model=PositionStats,
+    status_code=status.HTTP_200_OK,
+    description='Stored games that reached a position (or any of its symmetric images), with their outcomes.',
+)
+def read_position(
+    game_type: GameType,
+    board: str = Query(..., description="Row-major board of 'X', 'O' and '.' characters"),
+    limit: int = Query(100, ge=0, le=1000),
+    db: Session = Depends(get_db),
+):
+    if not is_valid_board(game_type, board):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Board does not match the game type"
+        )
+
+    matches = (
+        db.query(GamePosition)
+        .join(Game, Game.key == GamePosition.game_key)
+        .filter(GamePosition.position_hash == position_hash(game_type, board))
+        .filter(Game.game_type == game_type.value)
+    )
+    outcomes = dict(
+        matches.with_entities(Game.winner, func.count()).group_by(Game.winner).all()
+    )
+    games = (
+        matches.with_entities(Game.id, GamePosition.ply, Game.winner)
+        .order_by(GamePosition.game_key)
+        .limit(limit)
+        .all()
+    )
+
+    return PositionStats(
+        game_type=game_type,
+        board=board,
+        total_games=sum(outcomes.values()),
+        x_wins=outcomes.get('X', 0),
+        o_wins=outcomes.get('O', 0),
+        ties=outcomes.get('Tie', 0),
+        unfinished=outcomes.get(None, 0),
+        games=[PositionGame(game_id=game_id, ply=ply, winner=winner) for game_id, ply, winner in games],
+    )
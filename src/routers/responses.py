@@ -0,0 +1,27 @@
+from typing import Any, Optional
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+from src.views.game import COMPACT_MEDIA_TYPE
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Serializes content with pydantic-core's Rust encoder.
+
+    Return it directly from an endpoint (instead of setting response_model) to also skip
+    FastAPI's response validation and jsonable_encoder pass.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+
+def accepts_compact(request: Request) -> bool:
+    return COMPACT_MEDIA_TYPE in request.headers.get('accept', '')
+
+
+def wants_compact(request: Request, response_format: Optional[str]) -> bool:
+    return response_format == 'compact' or accepts_compact(request)
@@ -1,2 +1,3 @@
 from .connect_four import ConnectFour
+from .mnk_game import MNKGame
 from .tic_tac_toe import TicTacToe
\ No newline at end of file
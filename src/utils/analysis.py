@@ -0,0 +1,79 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from config import Config
+from src.views.game.create_game import GameType
+from .mnk import AlphaBetaSearch, Analysis, Bitboard, VARIANTS
+from .positions import canonical_orientation, position_hash
+
+
+class AnalysisJob(NamedTuple):
+    game_type: GameType
+    board: str
+    max_depth: int
+    time_limit: Optional[float]
+
+
+def analyze_position(game_type: GameType, board: str, max_depth: int = 64,
+                     time_limit: Optional[float] = 1.0) -> Analysis:
+    """Score every candidate move of a board string ('X', 'O', '.' row-major) with a fresh search."""
+    return AlphaBetaSearch().analyze(Bitboard.from_key(VARIANTS[game_type], board), max_depth, time_limit)
+
+
+def _run_job(job: AnalysisJob) -> Analysis:
+    return analyze_position(*job)
+
+
+def _reorient(analysis: Analysis, permutation: List[int]) -> Analysis:
+    """Map an analysis of the canonical board back onto the board it was read from."""
+    return analysis._replace(
+        best_move=permutation[analysis.best_move] if analysis.best_move is not None else None,
+        move_scores={permutation[cell]: score for cell, score in analysis.move_scores.items()},
+        principal_variation=[permutation[cell] for cell in analysis.principal_variation],
+    )
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # Spawned rather than forked, since the server process is already running threads
+        _pool = ProcessPoolExecutor(
+            max_workers=Config.ANALYSIS_WORKERS, mp_context=multiprocessing.get_context('spawn'),
+        )
+    return _pool
+
+
+def shutdown_analysis_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+def analyze_positions(jobs: Sequence[AnalysisJob]) -> List[Analysis]:
+    """
+    Analyse a batch of positions, in order.
+
+    Jobs with the same position hash and limits, so also rotated or mirrored boards, are searched once
+    on the canonical board and the result is mapped back to each requested orientation. The distinct
+    searches are spread over the worker pool.
+    """
+    canonical_jobs: Dict[Tuple[int, int, Optional[float]], AnalysisJob] = {}
+    permutations = []
+    for job in jobs:
+        canonical, permutation = canonical_orientation(job.game_type, job.board)
+        key = (position_hash(job.game_type, job.board), job.max_depth, job.time_limit)
+        canonical_jobs.setdefault(key, job._replace(board=canonical))
+        permutations.append((key, permutation))
+
+    unique_keys = list(canonical_jobs)
+    unique_jobs = [canonical_jobs[key] for key in unique_keys]
+    if Config.ANALYSIS_WORKERS > 0 and len(unique_jobs) > 1:
+        results = dict(zip(unique_keys, _get_pool().map(_run_job, unique_jobs)))
+    else:
+        results = {key: _run_job(job) for key, job in zip(unique_keys, unique_jobs)}
+    return [_reorient(results[key], permutation) for key, permutation in permutations]
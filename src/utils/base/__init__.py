@@ -1 +1,3 @@
-from .my_game import MyGame
\ No newline at end of file
+from .ai_engine import AiEngine
+from .my_game import MyGame
+from .ponder import PonderCancelled, Ponderer
\ No newline at end of file
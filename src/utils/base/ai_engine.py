@@ -0,0 +1,5 @@
+from enum import Enum
+
+class AiEngine(str, Enum):
+    MINIMAX = 'minimax'
+    MCTS = 'mcts'
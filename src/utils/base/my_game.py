@@ -1,9 +1,11 @@
 from abc import ABC, abstractmethod
 import json
-from typing import Optional
+from typing import Any, Callable, Iterable, Optional
 
 import httpx
 
+from .ponder import Ponderer
+from ..mnk import MonteCarloTreeSearch
 from src.views.game import GameRead, UpdateWinnerRequest
 from src.views.game.update_game_winner import WinnerEnum
 from src.views.move import MoveRead
@@ -16,6 +18,10 @@ class MyGame(ABC):
         self.game_type = game_type
         self.game_over = False
         self.player_turn: str = 'X'
+        # Set by _set_up_pondering, for games that search the human's likely replies during the human's turn
+        self._ponderer: Optional[Ponderer[str, Any]] = None
+        # Set by games with an MCTS engine, whose worker pool is shut down with the game
+        self._mcts: Optional[MonteCarloTreeSearch] = None
 
         self.current_game: GameRead = self.get_or_create_game()
         self._moves_url = f"{self._games_url}/{self.current_game.id}/moves"
@@ -68,7 +74,40 @@ class MyGame(ABC):
         except json.JSONDecodeError as e:
             raise RuntimeError(f"Failed to decode JSON response: {e}") from e
 
+    def _set_up_pondering(self, ponder: bool, think: Callable[[str], Any]) -> Optional[Callable[[], None]]:
+        """
+        Ponder with think(board_key) during the human's turn when ponder is set.
+
+        Returns the interrupt hook for the game's searches, or None when not pondering.
+        """
+        if not ponder:
+            return None
+        self._ponderer = Ponderer(think)
+        return self._ponderer.check
+
+    def _likely_replies(self, game_board) -> Iterable[str]:
+        """Board keys after the human's likely replies, most likely first; games that ponder override this."""
+        return []
+
+    def _start_pondering(self, game_board):
+        if self._ponderer is not None:
+            self._ponderer.start(self._likely_replies(game_board))
+
+    def _pondered_answer(self, key: str) -> Optional[Any]:
+        """The AI's move pondered for this board key, or None."""
+        if self._ponderer is None:
+            return None
+        return self._ponderer.answer(key)
+
+    def _pondering(self) -> bool:
+        """Whether the caller is the background ponder thread rather than the game itself."""
+        return self._ponderer is not None and self._ponderer.in_background()
+
     def _cleanup(self):
         print("Cleaning up game resources.")
+        if self._ponderer is not None:
+            self._ponderer.stop()
+        if self._mcts is not None:
+            self._mcts.close()
         self.current_game = None
         self._moves_url = None
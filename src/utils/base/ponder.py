@@ -0,0 +1,85 @@
+from threading import Condition, Event, Thread, current_thread
+from typing import Callable, Dict, Generic, Iterable, Optional, TypeVar
+
+Key = TypeVar('Key')
+Answer = TypeVar('Answer')
+
+
+class PonderCancelled(Exception):
+    ...
+
+
+class Ponderer(Generic[Key, Answer]):
+    """
+    Works out the AI's answers to the human's likely replies on a background thread, during the human's turn.
+
+    think(key) returns the AI's move for the position the human would reach with a reply. Searches it runs
+    should call check() now and then, so a stop interrupts them instead of running to the end.
+    """
+
+    def __init__(self, think: Callable[[Key], Answer]):
+        self._think = think
+        self._answers: Dict[Key, Answer] = {}
+        self._current: Optional[Key] = None
+        self._thread: Optional[Thread] = None
+        self._stop = Event()
+        self._lock = Condition()
+
+    def start(self, keys: Iterable[Key]):
+        """
+        Ponder the positions in keys, most likely first, replacing any earlier ponder.
+
+        keys is consumed on the ponder thread, so a generator can do its ranking work there too.
+        """
+        self.stop()
+        self._answers = {}
+        self._stop = Event()
+        self._thread = Thread(target=self._run, args=(keys, self._stop), name='ponder', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None and self._thread is not current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def in_background(self) -> bool:
+        """Whether the caller is running on the ponder thread."""
+        return self._thread is not None and current_thread() is self._thread
+
+    def check(self):
+        """Abandon the search with PonderCancelled if it runs on the ponder thread and pondering was stopped."""
+        if self._stop.is_set() and self.in_background():
+            raise PonderCancelled()
+
+    def answer(self, key: Key) -> Optional[Answer]:
+        """
+        Claim the pondered answer for the position the human actually reached, then stop pondering.
+
+        A finished answer comes back at once and the one being searched is waited for; any other position
+        is a miss and returns None.
+        """
+        with self._lock:
+            while key == self._current and key not in self._answers:
+                self._lock.wait()
+            answer = self._answers.get(key)
+        self.stop()
+        return answer
+
+    def _run(self, keys: Iterable[Key], stop: Event):
+        try:
+            for key in keys:
+                if stop.is_set():
+                    return
+                with self._lock:
+                    self._current = key
+                answer = self._think(key)
+                with self._lock:
+                    self._answers[key] = answer
+                    self._lock.notify_all()
+        except PonderCancelled:
+            pass
+        finally:
+            with self._lock:
+                self._current = None
+                self._lock.notify_all()
@@ -1,11 +1,13 @@
 import copy
 from datetime import datetime, UTC
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from uuid import uuid4
 
 import httpx
 
-from .base import MyGame
+from .base import AiEngine, MyGame
+from .mnk import EXACT, LOWER_BOUND, UPPER_BOUND, Bitboard, MonteCarloTreeSearch, VARIANTS
+from .symmetry import SYMMETRY_PRUNING_DEPTH, board_key, board_symmetries, canonical_key, child_key
 from src.views.game.create_game import GameType
 from src.views.move import MoveCreate, MoveRead
 from ..views.game.update_game_winner import WinnerEnum
@@ -20,14 +22,23 @@ class GameBoard:
             [None for _ in range(self.cols)] for _ in range(self.rows)
         ]
 
+SYMMETRIES = board_symmetries(6, 7, gravity=True)
+
+
 class IllegalMove(Exception):
     ...
 
 class ConnectFour(MyGame):
-    def __init__(self):
+    def __init__(self, engine: AiEngine = AiEngine.MINIMAX, ponder: bool = False, workers: int = 1):
         super().__init__(game_type=GameType.CONNECT4.value)
         self.ai_player = 'O'
         self.human_player = 'X'
+        # (score, bound) keyed by canonical position, so mirrored boards share one entry
+        self._transposition_table: Dict[Tuple[str, bool], Tuple[int, int]] = {}
+
+        self.engine = engine
+        interrupt = self._set_up_pondering(ponder, self._pondered_column)
+        self._mcts = MonteCarloTreeSearch(iterations=None, time_limit=2.0, workers=workers, interrupt=interrupt)
 
     def get_board(self) -> GameBoard:
         game_board: GameBoard = GameBoard()
@@ -79,6 +90,7 @@ class ConnectFour(MyGame):
                     return self.ai_move()
                 else:
                     self.player_turn = self.human_player
+                    self._start_pondering(game_board)
                     return "Human player, make your move"
 
             if result == 'X':
@@ -165,93 +177,188 @@ class ConnectFour(MyGame):
 
     def ai_move(self):
         game_board = self.get_board()
-        best_score = float('-inf')
-        best_col: Optional[int] = None
+        best_col = self._pondered_answer(board_key(game_board.board))
+        if best_col is not None:
+            print("AI already pondered this position")
+        else:
+            best_col = self._best_column(game_board)
 
-        # Introduce alpha-beta parameters into the initial call if desired
-        for col in range(game_board.cols):
+        if best_col is not None:
+            print(f"AI chooses column {best_col}")
+            return self.make_move(player=self.ai_player, col=best_col)
+        else:
+            return "No possible moves for AI."
+
+    def _best_column(self, game_board: GameBoard) -> Optional[int]:
+        if self.engine == AiEngine.MCTS:
+            return self._mcts_move(game_board)
+        return self._minimax_move(game_board)
+
+    def _likely_replies(self, game_board: GameBoard) -> List[str]:
+        """Board keys after each human drop, centre columns first since those are the usual replies."""
+        key = board_key(game_board.board)
+        centre = game_board.cols // 2
+        replies = []
+        for col in sorted(range(game_board.cols), key=lambda c: abs(c - centre)):
             row = self._find_lowest_empty_row(game_board, col)
             if row is not None:
-                # Simulate AI move
+                replies.append(child_key(key, row * game_board.cols + col, self.human_player))
+        return replies
+
+    def _pondered_column(self, key: str) -> Optional[int]:
+        game_board = GameBoard()
+        for cell, player in enumerate(key):
+            if player != '.':
+                row, col = divmod(cell, game_board.cols)
                 game_board.board[row][col] = MoveRead(
-                    id=str(uuid4()),
+                    ply=0,
                     game_id=str(uuid4()),
-                    player=self.ai_player,
+                    player=player,
                     row=row,
                     col=col,
                     timestamp=datetime.now(UTC)
                 )
-                score = self.minimax(game_board.board, 0, False, alpha=float('-inf'), beta=float('inf'))
-                # Undo move
-                game_board.board[row][col] = None
-                if score > best_score:
-                    best_score = score
-                    best_col = col
+        if self._check_win_conditions(game_board) is not None:
+            return None
+        return self._best_column(game_board)
 
-        if best_col is not None:
-            print(f"AI chooses column {best_col}")
-            return self.make_move(player=self.ai_player, col=best_col)
-        else:
-            return "No possible moves for AI."
+    def _minimax_move(self, game_board: GameBoard) -> Optional[int]:
+        best_score = float('-inf')
+        best_col: Optional[int] = None
+
+        # Mirrored columns lead to the same position, so only one of each pair is searched.
+        # The surviving column is always a real column of the current board.
+        for col in self._candidate_columns(game_board, self.ai_player, 0):
+            row = self._find_lowest_empty_row(game_board, col)
+            # Simulate AI move
+            game_board.board[row][col] = MoveRead(
+                ply=0,
+                game_id=str(uuid4()),
+                player=self.ai_player,
+                row=row,
+                col=col,
+                timestamp=datetime.now(UTC)
+            )
+            score = self.minimax(game_board.board, 0, False, alpha=float('-inf'), beta=float('inf'))
+            # Undo move
+            game_board.board[row][col] = None
+            if score > best_score:
+                best_score = score
+                best_col = col
+
+        return best_col
+
+    def _mcts_move(self, game_board: GameBoard) -> Optional[int]:
+        bitboard = Bitboard.from_key(VARIANTS[GameType.CONNECT4], board_key(game_board.board))
+        result = self._mcts.search(bitboard)
+        if result.move is None:
+            return None
+        if not self._pondering():
+            print(f"MCTS ran {result.iterations} iterations, win rate {result.win_rate:.2f}")
+        return result.move % game_board.cols
+
+    def _candidate_columns(self, game_board: GameBoard, player: str, depth: int) -> List[int]:
+        key = board_key(game_board.board)
+        seen = set()
+        columns = []
+        for col in range(game_board.cols):
+            row = self._find_lowest_empty_row(game_board, col)
+            if row is None:
+                continue
+            if depth < SYMMETRY_PRUNING_DEPTH:
+                child = canonical_key(child_key(key, row * game_board.cols + col, player), SYMMETRIES)
+                if child in seen:
+                    continue
+                seen.add(child)
+            columns.append(col)
+        return columns
 
     def minimax(self, board: List[List[Optional[MoveRead]]], depth: int, is_maximizing: bool,
                 alpha: float = float('-inf'), beta: float = float('inf')) -> int:
-        print(f"Depth: {depth}, is_maximizing: {is_maximizing}")
-        
+        if self._pondering():
+            self._ponderer.check()
+        else:
+            print(f"Depth: {depth}, is_maximizing: {is_maximizing}")
+
+        # Entries from an alpha-beta search may only be bounds on the true score
+        key = (canonical_key(board_key(board), SYMMETRIES), is_maximizing)
+        entry = self._transposition_table.get(key)
+        if entry is not None:
+            value, bound = entry
+            if bound == EXACT:
+                return value
+            elif bound == LOWER_BOUND:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if beta <= alpha:
+                return value
+        original_alpha, original_beta = alpha, beta
+
         temp_game_board = GameBoard()
         temp_game_board.board = copy.deepcopy(board)
         result = self._check_win_conditions(temp_game_board)
 
-        if result == self.human_player:
-            return -1
-        elif result == self.ai_player:
-            return 1
-        elif result == 'Tie':
-            return 0
+        if result is not None:
+            if result == self.human_player:
+                score = -1
+            elif result == self.ai_player:
+                score = 1
+            else:
+                score = 0
+            self._transposition_table[key] = (score, EXACT)
+            return score
 
         if is_maximizing:
             best_score = float('-inf')
-            for col in range(temp_game_board.cols):
+            for col in self._candidate_columns(temp_game_board, self.ai_player, depth):
                 row = self._find_lowest_empty_row(temp_game_board, col)
-                if row is not None:
-                    board[row][col] = MoveRead(
-                        id=str(uuid4()),
-                        game_id=str(uuid4()),
-                        player=self.ai_player,
-                        row=row,
-                        col=col,
-                        timestamp=datetime.now(UTC)
-                    )
-                    score = self.minimax(board, depth + 1, False, alpha, beta)
-                    board[row][col] = None
-                    best_score = max(score, best_score)
-
-                    alpha = max(alpha, best_score)
-                    if beta <= alpha:
+                board[row][col] = MoveRead(
+                    ply=0,
+                    game_id=str(uuid4()),
+                    player=self.ai_player,
+                    row=row,
+                    col=col,
+                    timestamp=datetime.now(UTC)
+                )
+                score = self.minimax(board, depth + 1, False, alpha, beta)
+                board[row][col] = None
+                best_score = max(score, best_score)
+
+                alpha = max(alpha, best_score)
+                if beta <= alpha:
+                    if not self._pondering():
                         print(f"Pruning branch")
-                        # Prune the branch
-                        break
-            return best_score
+                    # Prune the branch
+                    break
         else:
             best_score = float('inf')
-            for col in range(temp_game_board.cols):
+            for col in self._candidate_columns(temp_game_board, self.human_player, depth):
                 row = self._find_lowest_empty_row(temp_game_board, col)
-                if row is not None:
-                    board[row][col] = MoveRead(
-                        id=str(uuid4()),
-                        game_id=str(uuid4()),
-                        player=self.human_player,
-                        row=row,
-                        col=col,
-                        timestamp=datetime.now(UTC)
-                    )
-                    score = self.minimax(board, depth + 1, True, alpha, beta)
-                    board[row][col] = None
-                    best_score = min(score, best_score)
-
-                    beta = min(beta, best_score)
-                    if beta <= alpha:
+                board[row][col] = MoveRead(
+                    ply=0,
+                    game_id=str(uuid4()),
+                    player=self.human_player,
+                    row=row,
+                    col=col,
+                    timestamp=datetime.now(UTC)
+                )
+                score = self.minimax(board, depth + 1, True, alpha, beta)
+                board[row][col] = None
+                best_score = min(score, best_score)
+
+                beta = min(beta, best_score)
+                if beta <= alpha:
+                    if not self._pondering():
                         print(f"Pruning branch")
-                        # Prune the branch
-                        break
-            return best_score
+                    # Prune the branch
+                    break
+
+        if best_score <= original_alpha:
+            bound = UPPER_BOUND
+        elif best_score >= original_beta:
+            bound = LOWER_BOUND
+        else:
+            bound = EXACT
+        self._transposition_table[key] = (best_score, bound)
+        return best_score
@@ -0,0 +1,3 @@
+from .bitboard import Bitboard, PLAYERS, VARIANTS, Variant
+from .mcts import MCTSResult, MonteCarloTreeSearch
+from .search import EXACT, LOWER_BOUND, UPPER_BOUND, AlphaBetaSearch, Analysis, SearchResult
\ No newline at end of file
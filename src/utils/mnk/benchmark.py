@@ -0,0 +1,68 @@
+"""
+Plays the alpha-beta and MCTS engines against each other and reports strength and speed.
+
+    python -m src.utils.mnk.benchmark --game-type Connect4 --games 10 --time-limit 1.0 --workers 4
+"""
+import argparse
+import time
+from collections import Counter
+
+from src.views.game.create_game import GameType
+from .bitboard import Bitboard, PLAYERS, VARIANTS
+from .mcts import MonteCarloTreeSearch
+from .search import AlphaBetaSearch
+
+
+def play_match(game_type: GameType, games: int, time_limit: float, workers: int = 1) -> dict:
+    variant = VARIANTS[game_type]
+    outcomes = Counter()
+    alpha_beta_nodes = alpha_beta_time = 0.0
+    mcts_iterations = mcts_time = 0.0
+
+    for game in range(games):
+        alpha_beta = AlphaBetaSearch()
+        mcts = MonteCarloTreeSearch(iterations=None, time_limit=time_limit, workers=workers, seed=game)
+        # Swap colours every game so neither engine always moves first
+        engines = {PLAYERS[game % 2]: 'alpha-beta', PLAYERS[1 - game % 2]: 'mcts'}
+
+        board = Bitboard(variant)
+        while not board.is_over():
+            start = time.perf_counter()
+            if engines[board.player_to_move] == 'alpha-beta':
+                result = alpha_beta.search(board, time_limit=time_limit)
+                alpha_beta_nodes += result.nodes
+                alpha_beta_time += time.perf_counter() - start
+            else:
+                result = mcts.search(board)
+                mcts_iterations += result.iterations
+                mcts_time += time.perf_counter() - start
+            board.play(result.move)
+
+        mcts.close()
+        outcomes[engines.get(board.result(), 'tie')] += 1
+
+    return {
+        'game_type': game_type.value,
+        'games': games,
+        'alpha-beta wins': outcomes['alpha-beta'],
+        'mcts wins': outcomes['mcts'],
+        'ties': outcomes['tie'],
+        'alpha-beta nodes/s': round(alpha_beta_nodes / alpha_beta_time) if alpha_beta_time else 0,
+        'mcts iterations/s': round(mcts_iterations / mcts_time) if mcts_time else 0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--game-type', type=GameType, default=GameType.CONNECT4)
+    parser.add_argument('--games', type=int, default=4)
+    parser.add_argument('--time-limit', type=float, default=1.0)
+    parser.add_argument('--workers', type=int, default=1)
+    args = parser.parse_args()
+
+    for key, value in play_match(args.game_type, args.games, args.time_limit, args.workers).items():
+        print(f"{key:>20}: {value}")
+
+
+if __name__ == '__main__':
+    main()
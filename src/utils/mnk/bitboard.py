@@ -0,0 +1,252 @@
+from functools import lru_cache
+from itertools import zip_longest
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from src.views.game.create_game import GameType
+
+PLAYERS = ('X', 'O')
+
+# Open boards up to this many cells consider every empty cell as a candidate move
+FULL_WIDTH_CELLS = 64
+
+
+class Variant(NamedTuple):
+    rows: int
+    cols: int
+    k: int
+    gravity: bool
+
+
+VARIANTS: Dict[GameType, Variant] = {
+    GameType.TIC_TAC_TOE: Variant(rows=3, cols=3, k=3, gravity=False),
+    GameType.CONNECT4: Variant(rows=6, cols=7, k=4, gravity=True),
+    GameType.GOMOKU: Variant(rows=15, cols=15, k=5, gravity=False),
+    GameType.CONNECT4_LARGE: Variant(rows=8, cols=9, k=4, gravity=True),
+}
+
+
+class LineTables(NamedTuple):
+    windows: List[int]
+    through: List[List[int]]
+    neighbours: List[int]
+    centre_order: List[int]
+    weights: List[int]
+    full: int
+
+
+@lru_cache(maxsize=None)
+def line_tables(variant: Variant) -> LineTables:
+    """
+    Precomputed masks for a variant: every k-in-a-row window, the windows through each cell,
+    the cells near each cell (for candidate generation) and the cells sorted by distance to the centre.
+    """
+    rows, cols, k, _ = variant
+    windows = []
+    through: List[List[int]] = [[] for _ in range(rows * cols)]
+
+    for delta_row, delta_col in ((0, 1), (1, 0), (1, 1), (-1, 1)):
+        for r in range(rows):
+            for c in range(cols):
+                end_row = r + delta_row * (k - 1)
+                end_col = c + delta_col * (k - 1)
+                if not (0 <= end_row < rows and 0 <= end_col < cols):
+                    continue
+                cells = [(r + delta_row * i) * cols + c + delta_col * i for i in range(k)]
+                mask = sum(1 << cell for cell in cells)
+                windows.append(mask)
+                for cell in cells:
+                    through[cell].append(mask)
+
+    radius = 1 if k <= 3 else 2
+    neighbours = []
+    for r in range(rows):
+        for c in range(cols):
+            mask = 0
+            for nr in range(max(0, r - radius), min(rows, r + radius + 1)):
+                for nc in range(max(0, c - radius), min(cols, c + radius + 1)):
+                    if (nr, nc) != (r, c):
+                        mask |= 1 << (nr * cols + nc)
+            neighbours.append(mask)
+
+    centre_row, centre_col = (rows - 1) / 2, (cols - 1) / 2
+    centre_order = sorted(
+        range(rows * cols),
+        key=lambda cell: abs(cell // cols - centre_row) + abs(cell % cols - centre_col),
+    )
+
+    return LineTables(
+        windows=windows,
+        through=through,
+        neighbours=neighbours,
+        centre_order=centre_order,
+        # Heuristic weight of a window holding n stones of one player and none of the other
+        weights=[0] + [8 ** (n - 1) for n in range(1, k + 1)],
+        full=(1 << (rows * cols)) - 1,
+    )
+
+
+class Bitboard:
+    """
+    m x n board with a k-in-a-row rule, stored as one integer bitmask per player.
+
+    Cell indices are row-major (row * cols + col) with row 0 at the top, like the other game boards.
+    """
+
+    def __init__(self, variant: Variant):
+        self.variant = variant
+        self.rows, self.cols, self.k, self.gravity = variant
+        self.tables = line_tables(variant)
+        self.stones = [0, 0]
+        self.heights = [0] * self.cols
+        self.moves: List[int] = []
+        self.winner: Optional[str] = None
+
+    @classmethod
+    def from_moves(cls, variant: Variant, cells: Iterable[int]) -> 'Bitboard':
+        board = cls(variant)
+        for cell in cells:
+            board.play(cell)
+        return board
+
+    @classmethod
+    def from_key(cls, variant: Variant, key: str) -> 'Bitboard':
+        """
+        Board from a row-major string of 'X', 'O' and '.' cells.
+
+        The real move order is unknown, so the stones are replayed alternating X and O.
+        """
+        x_cells = [cell for cell, mark in enumerate(key) if mark == PLAYERS[0]]
+        o_cells = [cell for cell, mark in enumerate(key) if mark == PLAYERS[1]]
+        cells = [cell for pair in zip_longest(x_cells, o_cells) for cell in pair if cell is not None]
+        return cls.from_moves(variant, cells)
+
+    def copy(self) -> 'Bitboard':
+        board = Bitboard(self.variant)
+        board.stones = list(self.stones)
+        board.heights = list(self.heights)
+        board.moves = list(self.moves)
+        board.winner = self.winner
+        return board
+
+    def cell(self, row: int, col: int) -> int:
+        return row * self.cols + col
+
+    def coords(self, cell: int) -> Tuple[int, int]:
+        return divmod(cell, self.cols)
+
+    @property
+    def occupied(self) -> int:
+        return self.stones[0] | self.stones[1]
+
+    @property
+    def player_to_move(self) -> str:
+        return PLAYERS[len(self.moves) % 2]
+
+    def player_at(self, cell: int) -> Optional[str]:
+        bit = 1 << cell
+        if self.stones[0] & bit:
+            return PLAYERS[0]
+        if self.stones[1] & bit:
+            return PLAYERS[1]
+        return None
+
+    def is_full(self) -> bool:
+        return self.occupied == self.tables.full
+
+    def is_over(self) -> bool:
+        return self.winner is not None or self.is_full()
+
+    def result(self) -> Optional[str]:
+        if self.winner is not None:
+            return self.winner
+        if self.is_full():
+            return 'Tie'
+        return None
+
+    def drop_cell(self, col: int) -> Optional[int]:
+        """Cell a piece dropped in this column lands on, or None if the column is full."""
+        if self.heights[col] >= self.rows:
+            return None
+        return (self.rows - 1 - self.heights[col]) * self.cols + col
+
+    def is_legal(self, cell: int) -> bool:
+        if self.is_over() or not 0 <= cell < self.rows * self.cols:
+            return False
+        if self.gravity:
+            return self.drop_cell(cell % self.cols) == cell
+        return not self.occupied >> cell & 1
+
+    def legal_moves(self) -> List[int]:
+        if self.is_over():
+            return []
+        if self.gravity:
+            cells = (self.drop_cell(col) for col in range(self.cols))
+            return [cell for cell in cells if cell is not None]
+        occupied = self.occupied
+        return [cell for cell in range(self.rows * self.cols) if not occupied >> cell & 1]
+
+    def candidate_moves(self) -> List[int]:
+        """
+        Legal moves ordered centre-first. On large open boards only cells near existing stones
+        are considered, which keeps the branching factor manageable.
+        """
+        if self.is_over():
+            return []
+        if self.gravity or self.rows * self.cols <= FULL_WIDTH_CELLS:
+            legal = set(self.legal_moves())
+            return [cell for cell in self.tables.centre_order if cell in legal]
+
+        occupied = self.occupied
+        if not occupied:
+            return [self.tables.centre_order[0]]
+        near = 0
+        for cell in self.moves:
+            near |= self.tables.neighbours[cell]
+        near &= ~occupied
+        return [cell for cell in self.tables.centre_order if near >> cell & 1]
+
+    def play(self, cell: int) -> bool:
+        """Place the next stone on cell and return whether it completed a line."""
+        side = len(self.moves) % 2
+        self.stones[side] |= 1 << cell
+        if self.gravity:
+            self.heights[cell % self.cols] += 1
+        self.moves.append(cell)
+
+        # Only lines through the last move can have been completed by it
+        stones = self.stones[side]
+        for mask in self.tables.through[cell]:
+            if stones & mask == mask:
+                self.winner = PLAYERS[side]
+                return True
+        return False
+
+    def undo(self) -> int:
+        cell = self.moves.pop()
+        side = len(self.moves) % 2
+        self.stones[side] &= ~(1 << cell)
+        if self.gravity:
+            self.heights[cell % self.cols] -= 1
+        self.winner = None
+        return cell
+
+    def evaluate(self) -> int:
+        """Heuristic score from the perspective of the player to move."""
+        side = len(self.moves) % 2
+        mine, theirs = self.stones[side], self.stones[1 - side]
+        weights = self.tables.weights
+        score = 0
+        for mask in self.tables.windows:
+            if mask & theirs:
+                if not mask & mine:
+                    score -= weights[(mask & theirs).bit_count()]
+            elif mask & mine:
+                score += weights[(mask & mine).bit_count()]
+        return score
+
+    def key(self) -> str:
+        return ''.join(self.player_at(cell) or '.' for cell in range(self.rows * self.cols))
+
+    def __str__(self) -> str:
+        key = self.key()
+        return '\n'.join(key[r * self.cols:(r + 1) * self.cols] for r in range(self.rows))
@@ -0,0 +1,311 @@
+import math
+import multiprocessing
+import random
+import time
+from array import array
+from concurrent.futures import FIRST_EXCEPTION, ProcessPoolExecutor, wait
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from .bitboard import Bitboard, PLAYERS, Variant
+
+DEFAULT_EXPLORATION = math.sqrt(2)
+# The tree is discarded instead of reused once it holds this many nodes
+MAX_TREE_NODES = 2_000_000
+# How often, in seconds, a root-parallel search calls interrupt while it waits for its workers
+PARALLEL_POLL_INTERVAL = 0.05
+
+
+class MCTSResult(NamedTuple):
+    move: Optional[int]
+    win_rate: float
+    visits: int
+    iterations: int
+
+
+def rollout(board: Bitboard, rng: random.Random) -> Optional[str]:
+    """Play uniformly random moves on board until the game ends and return the result."""
+    if board.is_over():
+        return board.result()
+
+    if board.gravity:
+        open_cols = [col for col in range(board.cols) if board.heights[col] < board.rows]
+        while open_cols:
+            i = rng.randrange(len(open_cols))
+            col = open_cols[i]
+            if board.play(board.drop_cell(col)):
+                return board.winner
+            if board.heights[col] == board.rows:
+                open_cols[i] = open_cols[-1]
+                open_cols.pop()
+        return 'Tie'
+
+    # On open boards a shuffled list of the empty cells is already a random playout
+    empty = board.legal_moves()
+    rng.shuffle(empty)
+    for cell in empty:
+        if board.play(cell):
+            return board.winner
+    return 'Tie'
+
+
+class MonteCarloTreeSearch:
+    """
+    UCT search whose nodes live in flat arrays rather than per-node objects.
+
+    Children of a node are expanded together into one contiguous block, so a node only needs to know its
+    first child and how many children it has. The tree is kept between searches and re-rooted at the new
+    position when it was reached from the previous one.
+
+    With workers > 1 every search runs root-parallel over a process pool: each worker grows an independent
+    tree and the root statistics are summed. Those trees are not kept between moves.
+    """
+
+    def __init__(self, iterations: Optional[int] = 10_000, time_limit: Optional[float] = None,
+                 exploration: float = DEFAULT_EXPLORATION, workers: int = 1, seed: Optional[int] = None,
+                 interrupt: Optional[Callable[[], None]] = None):
+        if iterations is None and time_limit is None:
+            raise ValueError("MonteCarloTreeSearch needs an iteration count, a time limit or both")
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.exploration = exploration
+        self.workers = workers
+        # Called every few iterations, or while waiting for the workers; it may raise to abandon the search
+        self.interrupt = interrupt
+        self.rng = random.Random(seed)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # Set to make the pool's workers drop the search they are running
+        self._stop_workers = None
+        self._reset(None)
+
+    def _reset(self, variant: Optional[Variant]):
+        self.variant = variant
+        self.parent = array('i')
+        self.move = array('i')
+        self.first_child = array('i')
+        self.child_count = array('i')
+        self.visits = array('i')
+        # Wins are credited to the player who made the move leading into the node
+        self.wins = array('d')
+        self.root = -1
+        self._root_stones: Tuple[int, int] = (0, 0)
+        self._root_side = 0
+
+    def _add_node(self, parent: int, move: int) -> int:
+        self.parent.append(parent)
+        self.move.append(move)
+        self.first_child.append(-1)
+        self.child_count.append(0)
+        self.visits.append(0)
+        self.wins.append(0.0)
+        return len(self.parent) - 1
+
+    def _set_root(self, board: Bitboard):
+        """Re-root the kept tree at board, or start a new tree if board cannot be reached from the old root."""
+        previous = self._root_stones
+        stones = board.stones
+        if (
+            self.variant == board.variant
+            and self.root >= 0
+            and len(self.parent) < MAX_TREE_NODES
+            and not previous[0] & ~stones[0]
+            and not previous[1] & ~stones[1]
+        ):
+            # Follow the stones added since the old root, alternating sides, down the tree
+            remaining = [stones[0] & ~previous[0], stones[1] & ~previous[1]]
+            side = self._root_side
+            node = self.root
+            while node >= 0 and (remaining[0] or remaining[1]):
+                node = self._find_child(node, remaining[side])
+                if node >= 0:
+                    remaining[side] &= ~(1 << self.move[node])
+                    side = 1 - side
+            if node >= 0:
+                self.root = node
+                self._root_stones = tuple(stones)
+                self._root_side = side
+                return
+
+        self._reset(board.variant)
+        self.root = self._add_node(-1, -1)
+        self._root_stones = tuple(stones)
+        self._root_side = len(board.moves) % 2
+
+    def _find_child(self, node: int, cells: int) -> int:
+        """First child of node whose move is one of the cells in the mask."""
+        first = self.first_child[node]
+        for child in range(first, first + self.child_count[node]):
+            if cells >> self.move[child] & 1:
+                return child
+        return -1
+
+    def _expand(self, node: int, board: Bitboard):
+        moves = board.candidate_moves()
+        self.first_child[node] = len(self.parent)
+        self.child_count[node] = len(moves)
+        for move in moves:
+            self._add_node(node, move)
+
+    def _select_child(self, node: int) -> int:
+        first = self.first_child[node]
+        log_visits = math.log(self.visits[node] or 1)
+        best_child, best_value = first, -1.0
+        for child in range(first, first + self.child_count[node]):
+            visits = self.visits[child]
+            if visits == 0:
+                return child
+            value = self.wins[child] / visits + self.exploration * math.sqrt(log_visits / visits)
+            if value > best_value:
+                best_child, best_value = child, value
+        return best_child
+
+    def _iterate(self, board: Bitboard):
+        node = self.root
+        depth = 0
+
+        # Selection
+        while self.child_count[node] > 0:
+            node = self._select_child(node)
+            board.play(self.move[node])
+            depth += 1
+
+        # Expansion, once a leaf has been visited before
+        if not board.is_over() and (self.visits[node] > 0 or node == self.root):
+            self._expand(node, board)
+            if self.child_count[node] > 0:
+                node = self._select_child(node)
+                board.play(self.move[node])
+                depth += 1
+
+        # Simulation
+        playout = board.copy()
+        result = rollout(playout, self.rng)
+
+        # Backpropagation
+        mover = PLAYERS[(len(board.moves) - 1) % 2]
+        while True:
+            self.visits[node] += 1
+            if result == 'Tie':
+                self.wins[node] += 0.5
+            elif result == mover:
+                self.wins[node] += 1.0
+            # A reused tree still links the root to its old ancestors
+            if node == self.root:
+                break
+            mover = PLAYERS[0] if mover == PLAYERS[1] else PLAYERS[1]
+            node = self.parent[node]
+
+        for _ in range(depth):
+            board.undo()
+
+    def root_statistics(self) -> Dict[int, Tuple[int, float]]:
+        first = self.first_child[self.root]
+        return {
+            self.move[child]: (self.visits[child], self.wins[child])
+            for child in range(first, first + self.child_count[self.root])
+        }
+
+    def _run(self, board: Bitboard) -> int:
+        self._set_root(board)
+        board = board.copy()
+        deadline = time.perf_counter() + self.time_limit if self.time_limit is not None else None
+        iterations = 0
+        while self.iterations is None or iterations < self.iterations:
+            if iterations % 64 == 0:
+                if self.interrupt is not None:
+                    self.interrupt()
+                if deadline is not None and time.perf_counter() > deadline:
+                    break
+            self._iterate(board)
+            iterations += 1
+        return iterations
+
+    def search(self, board: Bitboard) -> MCTSResult:
+        if board.is_over():
+            return MCTSResult(move=None, win_rate=0.0, visits=0, iterations=0)
+
+        if self.workers > 1:
+            statistics, iterations = self._search_parallel(board)
+        else:
+            iterations = self._run(board)
+            statistics = self.root_statistics()
+
+        move, (visits, wins) = max(statistics.items(), key=lambda item: item[1][0])
+        return MCTSResult(move=move, win_rate=wins / visits if visits else 0.0, visits=visits, iterations=iterations)
+
+    def _search_parallel(self, board: Bitboard) -> Tuple[Dict[int, Tuple[int, float]], int]:
+        if self._pool is None:
+            # Spawned rather than forked, since the caller may already be running threads (pondering, servers)
+            context = multiprocessing.get_context('spawn')
+            self._stop_workers = context.Event()
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=context,
+                initializer=_init_worker, initargs=(self._stop_workers,),
+            )
+
+        self._stop_workers.clear()
+        iterations = self.iterations // self.workers if self.iterations is not None else None
+        futures = [
+            self._pool.submit(
+                _root_parallel_worker, board.variant, list(board.moves),
+                iterations, self.time_limit, self.exploration, self.rng.getrandbits(32),
+            )
+            for _ in range(self.workers)
+        ]
+
+        pending = set(futures)
+        try:
+            while pending:
+                _, pending = wait(pending, timeout=PARALLEL_POLL_INTERVAL, return_when=FIRST_EXCEPTION)
+                if pending and self.interrupt is not None:
+                    self.interrupt()
+        except BaseException:
+            # Workers cannot be cancelled once running, so tell them to stop and wait the few iterations
+            # that takes, leaving the pool free for the next search
+            self._stop_workers.set()
+            wait(futures)
+            raise
+
+        statistics: Dict[int, Tuple[int, float]] = {}
+        total_iterations = 0
+        for future in futures:
+            worker_statistics, worker_iterations = future.result()
+            total_iterations += worker_iterations
+            for move, (visits, wins) in worker_statistics.items():
+                total_visits, total_wins = statistics.get(move, (0, 0.0))
+                statistics[move] = (total_visits + visits, total_wins + wins)
+        return statistics, total_iterations
+
+    def close(self):
+        if self._pool is not None:
+            self._stop_workers.set()
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+
+class _WorkerStopped(Exception):
+    ...
+
+
+_worker_stop = None
+
+
+def _init_worker(stop):
+    global _worker_stop
+    _worker_stop = stop
+
+
+def _check_worker_stop():
+    if _worker_stop is not None and _worker_stop.is_set():
+        raise _WorkerStopped()
+
+
+def _root_parallel_worker(variant: Variant, moves: List[int], iterations: Optional[int],
+                          time_limit: Optional[float], exploration: float,
+                          seed: int) -> Tuple[Dict[int, Tuple[int, float]], int]:
+    search = MonteCarloTreeSearch(iterations=iterations, time_limit=time_limit, exploration=exploration,
+                                  seed=seed, interrupt=_check_worker_stop)
+    try:
+        count = search._run(Bitboard.from_moves(variant, moves))
+    except _WorkerStopped:
+        return {}, 0
+    return search.root_statistics(), count
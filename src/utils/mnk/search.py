@@ -0,0 +1,237 @@
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from .bitboard import Bitboard
+
+WIN_SCORE = 1_000_000
+# Scores beyond this are forced wins/losses, offset by the ply they happen on
+WIN_THRESHOLD = WIN_SCORE - 10_000
+
+# Transposition table bound types
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+# How many nodes are searched between clock checks; a Gomoku node can take a few hundred microseconds
+TIME_CHECK_INTERVAL = 64
+
+# Transposition table entries kept at most, roughly 200 bytes each
+MAX_TABLE_SIZE = 500_000
+
+
+class SearchTimeout(Exception):
+    ...
+
+
+class SearchResult(NamedTuple):
+    move: Optional[int]
+    score: int
+    depth: int
+    nodes: int
+
+
+class Analysis(NamedTuple):
+    best_move: Optional[int]
+    score: int
+    move_scores: Dict[int, int]
+    principal_variation: List[int]
+    depth: int
+    nodes: int
+
+
+class AlphaBetaSearch:
+    """
+    Iterative-deepening negamax with alpha-beta pruning over a Bitboard.
+
+    The transposition table outlives a single search, so consecutive moves of the same game reuse it.
+    Positions with fewer stones than the board being searched can no longer occur and are dropped, and
+    once the table holds max_table_size entries only existing ones are overwritten.
+    """
+
+    def __init__(self, interrupt: Optional[Callable[[], None]] = None, max_table_size: int = MAX_TABLE_SIZE):
+        # Called every TIME_CHECK_INTERVAL nodes; it may raise to abandon the search
+        self.interrupt = interrupt
+        self.max_table_size = max_table_size
+        self.table: Dict[Tuple[int, int], Tuple[int, int, int, Optional[int]]] = {}
+        self.nodes = 0
+        self._deadline: Optional[float] = None
+
+    def search(self, board: Bitboard, max_depth: int = 64, time_limit: Optional[float] = None) -> SearchResult:
+        board = board.copy()
+        self.nodes = 0
+        self._deadline = time.perf_counter() + time_limit if time_limit is not None else None
+        self._age_table(board)
+
+        moves = board.candidate_moves()
+        if not moves:
+            return SearchResult(move=None, score=0, depth=0, nodes=0)
+
+        best = SearchResult(move=moves[0], score=0, depth=0, nodes=0)
+        remaining = board.rows * board.cols - len(board.moves)
+        for depth in range(1, min(max_depth, remaining) + 1):
+            try:
+                score, move = self._search_root(board, depth)
+            except SearchTimeout:
+                break
+            best = SearchResult(move=move, score=score, depth=depth, nodes=self.nodes)
+            if abs(score) >= WIN_THRESHOLD:
+                break
+        return best._replace(nodes=self.nodes)
+
+    def analyze(self, board: Bitboard, max_depth: int = 64, time_limit: Optional[float] = None) -> Analysis:
+        """
+        Like search, but every root move is searched with a full window so each gets an exact score.
+
+        Scores are from the perspective of the player to move; forced wins and losses are
+        +/-(WIN_SCORE - plies until the end).
+        """
+        board = board.copy()
+        self.nodes = 0
+        self._deadline = time.perf_counter() + time_limit if time_limit is not None else None
+        self._age_table(board)
+
+        moves = board.candidate_moves()
+        if not moves:
+            return Analysis(best_move=None, score=0, move_scores={}, principal_variation=[], depth=0, nodes=0)
+
+        analysis = Analysis(
+            best_move=moves[0], score=0, move_scores={}, principal_variation=[], depth=0, nodes=0,
+        )
+        remaining = board.rows * board.cols - len(board.moves)
+        for depth in range(1, min(max_depth, remaining) + 1):
+            move_scores = {}
+            try:
+                for move in self._ordered_moves(board):
+                    board.play(move)
+                    try:
+                        move_scores[move] = -self._negamax(board, depth - 1, -WIN_SCORE - 1, WIN_SCORE + 1, 1)
+                    finally:
+                        board.undo()
+            except SearchTimeout:
+                break
+
+            best_move = max(move_scores, key=move_scores.get)
+            self._store(board, depth, move_scores[best_move], EXACT, best_move, 0)
+            analysis = Analysis(
+                best_move=best_move,
+                score=move_scores[best_move],
+                move_scores=move_scores,
+                principal_variation=self._principal_variation(board, depth),
+                depth=depth,
+                nodes=self.nodes,
+            )
+            if all(abs(score) >= WIN_THRESHOLD for score in move_scores.values()):
+                break
+        return analysis._replace(nodes=self.nodes)
+
+    def _age_table(self, board: Bitboard):
+        # Stones are never taken back in a real game, so these positions cannot come up again
+        stones = len(board.moves)
+        self.table = {key: entry for key, entry in self.table.items() if (key[0] | key[1]).bit_count() >= stones}
+
+    def _principal_variation(self, board: Bitboard, depth: int) -> List[int]:
+        """Follow the best moves stored in the transposition table from board."""
+        line = []
+        while len(line) < depth and not board.is_over():
+            entry = self.table.get((board.stones[0], board.stones[1]))
+            if entry is None or entry[3] is None or not board.is_legal(entry[3]):
+                break
+            board.play(entry[3])
+            line.append(entry[3])
+        for _ in line:
+            board.undo()
+        return line
+
+    def _search_root(self, board: Bitboard, depth: int) -> Tuple[int, Optional[int]]:
+        alpha, beta = -WIN_SCORE - 1, WIN_SCORE + 1
+        best_score, best_move = alpha, None
+        for move in self._ordered_moves(board):
+            board.play(move)
+            try:
+                score = -self._negamax(board, depth - 1, -beta, -alpha, 1)
+            finally:
+                board.undo()
+            if score > best_score:
+                best_score, best_move = score, move
+            alpha = max(alpha, score)
+        self._store(board, depth, best_score, EXACT, best_move, 0)
+        return best_score, best_move
+
+    def _negamax(self, board: Bitboard, depth: int, alpha: int, beta: int, ply: int) -> int:
+        self.nodes += 1
+        if self.nodes % TIME_CHECK_INTERVAL == 0:
+            if self.interrupt is not None:
+                self.interrupt()
+            if self._deadline is not None and time.perf_counter() > self._deadline:
+                raise SearchTimeout()
+
+        # The player who just moved has won, which is a loss for the player to move
+        if board.winner is not None:
+            return -(WIN_SCORE - ply)
+        if board.is_full():
+            return 0
+        if depth == 0:
+            return board.evaluate()
+
+        original_alpha = alpha
+        entry = self.table.get((board.stones[0], board.stones[1]))
+        if entry is not None and entry[0] >= depth:
+            _, score, bound, _ = entry
+            score = self._from_table(score, ply)
+            if bound == EXACT:
+                return score
+            elif bound == LOWER_BOUND:
+                alpha = max(alpha, score)
+            else:
+                beta = min(beta, score)
+            if alpha >= beta:
+                return score
+
+        best_score, best_move = -WIN_SCORE - 1, None
+        for move in self._ordered_moves(board):
+            board.play(move)
+            try:
+                score = -self._negamax(board, depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                board.undo()
+            if score > best_score:
+                best_score, best_move = score, move
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+
+        if best_score <= original_alpha:
+            bound = UPPER_BOUND
+        elif best_score >= beta:
+            bound = LOWER_BOUND
+        else:
+            bound = EXACT
+        self._store(board, depth, best_score, bound, best_move, ply)
+        return best_score
+
+    def _ordered_moves(self, board: Bitboard) -> List[int]:
+        moves = board.candidate_moves()
+        entry = self.table.get((board.stones[0], board.stones[1]))
+        if entry is not None and entry[3] in moves:
+            moves.remove(entry[3])
+            moves.insert(0, entry[3])
+        return moves
+
+    def _store(self, board: Bitboard, depth: int, score: int, bound: int, move: Optional[int], ply: int):
+        # Win scores are stored relative to this node so they stay valid from any ply
+        if score >= WIN_THRESHOLD:
+            score += ply
+        elif score <= -WIN_THRESHOLD:
+            score -= ply
+        key = (board.stones[0], board.stones[1])
+        if len(self.table) >= self.max_table_size and key not in self.table:
+            return
+        self.table[key] = (depth, score, bound, move)
+
+    @staticmethod
+    def _from_table(score: int, ply: int) -> int:
+        if score >= WIN_THRESHOLD:
+            return score - ply
+        if score <= -WIN_THRESHOLD:
+            return score + ply
+        return score
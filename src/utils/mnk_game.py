@@ -0,0 +1,163 @@
+from typing import Iterator, Optional, Tuple
+
+import httpx
+
+from .base import AiEngine, MyGame
+from .mnk import AlphaBetaSearch, Bitboard, MonteCarloTreeSearch, VARIANTS
+from src.views.game.create_game import GameType
+from src.views.move import MoveCreate, MoveRead
+from ..views.game.update_game_winner import WinnerEnum
+from ..views.move.position import Position
+
+
+# How many of the human's best-looking replies are pondered
+PONDER_REPLIES = 8
+
+
+class IllegalMove(Exception):
+    ...
+
+
+class MNKGame(MyGame):
+    """
+    Any m x n, k-in-a-row game from VARIANTS, with or without gravity.
+
+    Gravity variants only need a column for a move; open variants need both row and col. With workers > 1
+    the MCTS engine runs root-parallel over that many processes.
+    """
+
+    def __init__(self, game_type: GameType = GameType.GOMOKU, engine: AiEngine = AiEngine.MINIMAX,
+                 time_limit: float = 2.0, max_depth: int = 64, ponder: bool = False,
+                 workers: int = 1):
+        self.variant = VARIANTS[game_type]
+        super().__init__(game_type=game_type.value)
+        self.ai_player = 'O'
+        self.human_player = 'X'
+        self.time_limit = time_limit
+        self.max_depth = max_depth
+        self.engine = engine
+        interrupt = self._set_up_pondering(ponder, self._pondered_move)
+        self._search = AlphaBetaSearch(interrupt=interrupt)
+        self._mcts = MonteCarloTreeSearch(
+            iterations=None, time_limit=time_limit, workers=workers, interrupt=interrupt,
+        )
+
+    def get_board(self) -> Bitboard:
+        game_board = Bitboard(self.variant)
+        completed_moves: list[MoveRead] = self.get_moves()
+
+        for cm in completed_moves:
+            cell = game_board.cell(cm.row, cm.col)
+            if game_board.player_at(cell) is None:
+                game_board.play(cell)
+
+        return game_board
+
+    def print_board(self):
+        game_board = self.get_board()
+        width = len(str(game_board.cols - 1))
+        for r in range(game_board.rows):
+            formatted_row = [
+                (game_board.player_at(game_board.cell(r, c)) or '.').rjust(width) for c in range(game_board.cols)
+            ]
+            print(f"{r:>{width}}  " + " ".join(formatted_row))
+
+        print(" " * (width + 2) + " ".join(str(c).rjust(width) for c in range(game_board.cols)))
+
+    def make_move(self, player: str, col: int, row: Optional[int] = None) -> str:
+        if self.game_over:
+            return "The game is already over"
+
+        if player != self.player_turn:
+            return f"It's not player {player}'s turn"
+
+        game_board = self.get_board()
+        if self.variant.gravity:
+            cell = game_board.drop_cell(col) if 0 <= col < game_board.cols else None
+            if cell is None:
+                return "Column is full, pick another column."
+            row = cell // game_board.cols
+        elif row is None:
+            raise IllegalMove("A row is required for this game type.")
+
+        attempted_move = MoveCreate(
+            player=player,
+            position=Position(row=row, col=col),
+        )
+
+        if not self._is_legal_move(game_board, attempted_move):
+            raise IllegalMove(f"Performing illegal move: {attempted_move.model_dump()}")
+
+        response = httpx.post(self._moves_url, json=attempted_move.model_dump())
+        response.raise_for_status()
+
+        game_board = self.get_board()
+        result = game_board.result()
+        self.print_board()
+
+        if not result:
+            if self.player_turn == self.human_player:
+                self.player_turn = self.ai_player
+                return self.ai_move()
+            else:
+                self.player_turn = self.human_player
+                self._start_pondering(game_board)
+                return "Human player, make your move"
+
+        self.update_game_winner(WinnerEnum(result))
+        self.game_over = True
+        self._cleanup()
+        if result == 'Tie':
+            return "The game is a tie!"
+        return f"Player {result} wins!"
+
+    def _is_legal_move(self, game_board: Bitboard, attempted_move: MoveCreate) -> bool:
+        if attempted_move.player != self.player_turn:
+            return False
+
+        row = attempted_move.position.row
+        col = attempted_move.position.col
+        if not (0 <= row < game_board.rows and 0 <= col < game_board.cols):
+            return False
+        return game_board.is_legal(game_board.cell(row, col))
+
+    def ai_move(self):
+        game_board = self.get_board()
+        move = self._pondered_answer(game_board.key())
+        summary = "pondering during the human's turn"
+        if move is None:
+            move, summary = self._best_move(game_board)
+
+        if move is not None:
+            row, col = game_board.coords(move)
+            print(f"AI chooses ({row}, {col}) after {summary}")
+            return self.make_move(player=self.ai_player, col=col, row=row)
+        else:
+            return "No possible moves for AI."
+
+    def _best_move(self, game_board: Bitboard) -> Tuple[Optional[int], str]:
+        if self.engine == AiEngine.MCTS:
+            result = self._mcts.search(game_board)
+            return result.move, f"{result.iterations} MCTS iterations"
+        result = self._search.search(game_board, max_depth=self.max_depth, time_limit=self.time_limit)
+        return result.move, f"searching {result.nodes} nodes to depth {result.depth}"
+
+    def _likely_replies(self, game_board: Bitboard) -> Iterator[str]:
+        """
+        Board keys after the human's best-looking replies, best first.
+
+        This is a generator, so the shallow search that ranks the replies also runs on the ponder thread.
+        """
+        analysis = self._search.analyze(game_board, max_depth=2, time_limit=self.time_limit / 10)
+        ranked = sorted(analysis.move_scores, key=analysis.move_scores.get, reverse=True)
+        for cell in (ranked or game_board.candidate_moves())[:PONDER_REPLIES]:
+            game_board.play(cell)
+            yield game_board.key()
+            game_board.undo()
+
+    def _pondered_move(self, key: str) -> Optional[int]:
+        game_board = Bitboard.from_key(self.variant, key)
+        if game_board.is_over():
+            return None
+        move, _ = self._best_move(game_board)
+        return move
@@ -0,0 +1,61 @@
+from functools import lru_cache
+from hashlib import blake2b
+from typing import Iterable, List, Tuple
+
+from src.views.game.create_game import GameType
+from .mnk import VARIANTS
+from .symmetry import board_symmetries, canonical_key, child_key
+
+
+@lru_cache(maxsize=None)
+def _symmetries(game_type: GameType) -> List[List[int]]:
+    variant = VARIANTS[game_type]
+    return board_symmetries(variant.rows, variant.cols, variant.gravity)
+
+
+def is_valid_board(game_type: GameType, board: str) -> bool:
+    variant = VARIANTS[game_type]
+    return len(board) == variant.rows * variant.cols and set(board) <= {'X', 'O', '.'}
+
+
+def board_string(game_type: GameType, moves: Iterable[Tuple[int, str]]) -> str:
+    """Row-major 'X', 'O', '.' string of the board after the given (cell, player) moves."""
+    variant = VARIANTS[game_type]
+    board = ['.'] * (variant.rows * variant.cols)
+    for cell, player in moves:
+        board[cell] = player
+    return ''.join(board)
+
+
+def canonical_orientation(game_type: GameType, board: str) -> Tuple[str, List[int]]:
+    """
+    The canonical image of a board string and the permutation that produced it.
+
+    Cell i of the canonical board is cell permutation[i] of the given one.
+    """
+    return min(
+        ((''.join(board[i] for i in permutation), permutation) for permutation in _symmetries(game_type)),
+        key=lambda orientation: orientation[0],
+    )
+
+
+def position_hash(game_type: GameType, board: str) -> int:
+    """
+    Signed 64-bit hash of a board string ('X', 'O', '.' row-major), equal for all symmetric boards.
+
+    The game type is part of the hash, so equal strings from different variants never collide.
+    """
+    canonical = canonical_key(board, _symmetries(game_type))
+    digest = blake2b(f"{game_type.value}:{canonical}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+
+def position_hashes(game_type: GameType, moves: Iterable[Tuple[int, str]]) -> List[int]:
+    """Hash of the position after each (cell, player) move, in order."""
+    variant = VARIANTS[game_type]
+    board = '.' * (variant.rows * variant.cols)
+    hashes = []
+    for cell, player in moves:
+        board = child_key(board, cell, player)
+        hashes.append(position_hash(game_type, board))
+    return hashes
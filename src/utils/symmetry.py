@@ -0,0 +1,54 @@
+from typing import Iterable, List, Optional, Sequence
+
+from src.views.move import MoveRead
+
+# Searches skip symmetric duplicates of a move at nodes shallower than this depth.
+# Deeper nodes rely on the canonical transposition keys instead.
+SYMMETRY_PRUNING_DEPTH = 2
+
+
+def board_key(board: List[List[Optional[MoveRead]]]) -> str:
+    return ''.join(cell.player if cell is not None else '.' for row in board for cell in row)
+
+
+def board_symmetries(rows: int, cols: int, gravity: bool = False) -> List[List[int]]:
+    """
+    Cell permutations for every symmetry of a rows x cols board.
+
+    Each permutation maps a cell index of the transformed board to the cell index it is read from.
+    Gravity boards only keep the left-right mirror, since flipping vertically would float the pieces.
+    """
+    def permutation(transform) -> List[int]:
+        return [transform(r, c) for r in range(rows) for c in range(cols)]
+
+    def index(r: int, c: int) -> int:
+        return r * cols + c
+
+    symmetries = [
+        permutation(lambda r, c: index(r, c)),
+        permutation(lambda r, c: index(r, cols - 1 - c)),
+    ]
+    if gravity:
+        return symmetries
+
+    symmetries += [
+        permutation(lambda r, c: index(rows - 1 - r, c)),
+        permutation(lambda r, c: index(rows - 1 - r, cols - 1 - c)),
+    ]
+    if rows == cols:
+        n = rows
+        symmetries += [
+            permutation(lambda r, c: index(c, r)),
+            permutation(lambda r, c: index(n - 1 - c, n - 1 - r)),
+            permutation(lambda r, c: index(c, n - 1 - r)),
+            permutation(lambda r, c: index(n - 1 - c, r)),
+        ]
+    return symmetries
+
+
+def canonical_key(key: str, symmetries: Iterable[Sequence[int]]) -> str:
+    return min(''.join(key[i] for i in permutation) for permutation in symmetries)
+
+
+def child_key(key: str, index: int, player: str) -> str:
+    return key[:index] + player + key[index + 1:]
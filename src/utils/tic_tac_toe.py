@@ -1,12 +1,14 @@
 import copy
 from datetime import datetime, UTC
 import json
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from uuid import uuid4
 
 import httpx
 
-from .base import MyGame
+from .base import AiEngine, MyGame
+from .mnk import Bitboard, MonteCarloTreeSearch, VARIANTS
+from .symmetry import SYMMETRY_PRUNING_DEPTH, board_key, board_symmetries, canonical_key, child_key
 from src.views.game.create_game import GameType
 from src.views.move import MoveCreate, MoveRead
 from ..views.game.update_game_winner import WinnerEnum
@@ -20,16 +22,25 @@ class GameBoard:
             [None, None, None],
         ]
 
+
+SYMMETRIES = board_symmetries(3, 3)
+
         
 class IllegalMove(Exception): ...
 
 
 class TicTacToe(MyGame):
-    def __init__(self):
+    def __init__(self, engine: AiEngine = AiEngine.MINIMAX, ponder: bool = False, workers: int = 1):
         super().__init__(game_type=GameType.TIC_TAC_TOE.value)
 
         self.ai_player = 'O'
         self.human_player = 'X'
+        # Scores keyed by canonical position, so all 8 symmetric boards share one entry
+        self._transposition_table: Dict[Tuple[str, bool], int] = {}
+
+        self.engine = engine
+        interrupt = self._set_up_pondering(ponder, self._pondered_move)
+        self._mcts = MonteCarloTreeSearch(iterations=5_000, workers=workers, interrupt=interrupt)
 
     def print_board(self):
         game_board = self.get_board()
@@ -81,6 +92,7 @@ class TicTacToe(MyGame):
                         return self.ai_move()
                     if self.player_turn == self.ai_player:
                         self.player_turn = self.human_player
+                        self._start_pondering(game_board)
                         return "Player X make your move"
 
                 if result == 'X':
@@ -167,28 +179,12 @@ class TicTacToe(MyGame):
 
     def ai_move(self):
         game_board = self.get_board()
-        best_score = float('-inf')
-        best_move: Optional[Tuple[int, int]] = None
-    
-        for row in range(3):
-            for col in range(3):
-                if game_board.board[row][col] is None:
-                    # noinspection PyTypeChecker
-                    game_board.board[row][col] = MoveRead(
-                        id=str(uuid4()),
-                        game_id=str(uuid4()),
-                        player=self.ai_player,
-                        row=row,
-                        col=col,
-                        timestamp=datetime.now(UTC)
-                    )
-                    score = self.minimax(game_board.board, 0, False)
-                    # Undo move
-                    game_board.board[row][col] = None
-                    if score > best_score:
-                        best_score = score
-                        best_move = (row, col)
-    
+        best_move = self._pondered_answer(board_key(game_board.board))
+        if best_move is not None:
+            print("AI already pondered this position")
+        else:
+            best_move = self._best_move(game_board)
+
         if best_move:
             row, col = best_move
             print(f"AI chooses to place at ({row}, {col})")
@@ -196,56 +192,137 @@ class TicTacToe(MyGame):
         else:
             return "No possible moves for AI."
 
+    def _best_move(self, game_board: GameBoard) -> Optional[Tuple[int, int]]:
+        if self.engine == AiEngine.MCTS:
+            return self._mcts_move(game_board)
+        return self._minimax_move(game_board)
+
+    def _likely_replies(self, game_board: GameBoard) -> List[str]:
+        """Board keys after each human reply, centre and corners before edges."""
+        key = board_key(game_board.board)
+        cells = [4, 0, 2, 6, 8, 1, 3, 5, 7]
+        return [child_key(key, cell, self.human_player) for cell in cells if key[cell] == '.']
+
+    def _pondered_move(self, key: str) -> Optional[Tuple[int, int]]:
+        game_board = GameBoard()
+        for cell, player in enumerate(key):
+            if player != '.':
+                row, col = divmod(cell, 3)
+                # noinspection PyTypeChecker
+                game_board.board[row][col] = MoveRead(
+                    ply=0,
+                    game_id=str(uuid4()),
+                    player=player,
+                    row=row,
+                    col=col,
+                    timestamp=datetime.now(UTC)
+                )
+        if self._check_win_conditions(game_board) is not None:
+            return None
+        return self._best_move(game_board)
+
+    def _minimax_move(self, game_board: GameBoard) -> Optional[Tuple[int, int]]:
+        best_score = float('-inf')
+        best_move: Optional[Tuple[int, int]] = None
+
+        # Only one move per symmetry class is searched; it is already a cell on the real board.
+        for row, col in self._candidate_moves(game_board.board, self.ai_player, 0):
+            # noinspection PyTypeChecker
+            game_board.board[row][col] = MoveRead(
+                ply=0,
+                game_id=str(uuid4()),
+                player=self.ai_player,
+                row=row,
+                col=col,
+                timestamp=datetime.now(UTC)
+            )
+            score = self.minimax(game_board.board, 0, False)
+            # Undo move
+            game_board.board[row][col] = None
+            if score > best_score:
+                best_score = score
+                best_move = (row, col)
+
+        return best_move
+
+    def _mcts_move(self, game_board: GameBoard) -> Optional[Tuple[int, int]]:
+        bitboard = Bitboard.from_key(VARIANTS[GameType.TIC_TAC_TOE], board_key(game_board.board))
+        result = self._mcts.search(bitboard)
+        if result.move is None:
+            return None
+        if not self._pondering():
+            print(f"MCTS ran {result.iterations} iterations, win rate {result.win_rate:.2f}")
+        return bitboard.coords(result.move)
+
+    @staticmethod
+    def _candidate_moves(board: List[List[Optional[MoveRead]]], player: str, depth: int) -> List[Tuple[int, int]]:
+        key = board_key(board)
+        seen = set()
+        moves = []
+        for row in range(3):
+            for col in range(3):
+                if board[row][col] is not None:
+                    continue
+                if depth < SYMMETRY_PRUNING_DEPTH:
+                    child = canonical_key(child_key(key, row * 3 + col, player), SYMMETRIES)
+                    if child in seen:
+                        continue
+                    seen.add(child)
+                moves.append((row, col))
+        return moves
+
     def minimax(self, board: List[List[Optional[MoveRead]]], depth: int, is_maximizing: bool) -> int:
-        print(f"Depth: {depth}, is_maximizing: {is_maximizing}")
+        if self._pondering():
+            self._ponderer.check()
+        else:
+            print(f"Depth: {depth}, is_maximizing: {is_maximizing}")
+
+        key = (canonical_key(board_key(board), SYMMETRIES), is_maximizing)
+        if key in self._transposition_table:
+            return self._transposition_table[key]
 
         temp_game_board = GameBoard()
         temp_game_board.board = copy.deepcopy(board)
         result = self._check_win_conditions(temp_game_board)
     
         if result == self.human_player:
-            return -1
+            best_score = -1
         elif result == self.ai_player:
-            return 1
+            best_score = 1
         elif result == 'Tie':
-            return 0
-    
-        if is_maximizing:
+            best_score = 0
+        elif is_maximizing:
             best_score = float('-inf')
-            for row in range(3):
-                for col in range(3):
-                    if board[row][col] is None:
-                        # Simulate AI move
-                        # noinspection PyTypeChecker
-                        board[row][col] = MoveRead(
-                            id=str(uuid4()),
-                            game_id=str(uuid4()),
-                            player=self.ai_player,
-                            row=row,
-                            col=col,
-                            timestamp=datetime.now(UTC)
-                        )
-                        score = self.minimax(board, depth + 1, False)
-                        board[row][col] = None
-                        best_score = max(score, best_score)
-            return best_score
+            for row, col in self._candidate_moves(board, self.ai_player, depth):
+                # Simulate AI move
+                # noinspection PyTypeChecker
+                board[row][col] = MoveRead(
+                    ply=0,
+                    game_id=str(uuid4()),
+                    player=self.ai_player,
+                    row=row,
+                    col=col,
+                    timestamp=datetime.now(UTC)
+                )
+                score = self.minimax(board, depth + 1, False)
+                board[row][col] = None
+                best_score = max(score, best_score)
         else:
             best_score = float('inf')
-            for row in range(3):
-                for col in range(3):
-                    if board[row][col] is None:
-                        # Simulate Human move
-                        # noinspection PyTypeChecker
-                        board[row][col] = MoveRead(
-                            id=str(uuid4()),
-                            game_id=str(uuid4()),
-                            player=self.human_player,
-                            row=row,
-                            col=col,
-                            timestamp=datetime.now(UTC)
-                        )
-                        score = self.minimax(board, depth + 1, True)
-                        board[row][col] = None
-                        best_score = min(score, best_score)
-            return best_score
+            for row, col in self._candidate_moves(board, self.human_player, depth):
+                # Simulate Human move
+                # noinspection PyTypeChecker
+                board[row][col] = MoveRead(
+                    ply=0,
+                    game_id=str(uuid4()),
+                    player=self.human_player,
+                    row=row,
+                    col=col,
+                    timestamp=datetime.now(UTC)
+                )
+                score = self.minimax(board, depth + 1, True)
+                board[row][col] = None
+                best_score = min(score, best_score)
 
+        self._transposition_table[key] = best_score
+        return best_score
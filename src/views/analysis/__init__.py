@@ -0,0 +1,2 @@
+from .analysis_request import AnalysisRequest, PositionRequest
+from .analysis_result import AnalysisResponse, MoveScore, PositionAnalysis
\ No newline at end of file
@@ -0,0 +1,22 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+from ..game.create_game import GameType
+from ..move.position import Position
+
+class PositionRequest(BaseModel):
+    game_type: GameType
+    board: Optional[str] = Field(None, description="Row-major board of 'X', 'O' and '.' characters")
+    moves: Optional[List[Position]] = Field(None, description="Moves from the empty board, X first")
+    max_depth: int = Field(64, ge=1, le=64)
+    time_limit: float = Field(1.0, gt=0, le=30)
+
+    @model_validator(mode='after')
+    def validate_board_or_moves(self):
+        if (self.board is None) == (self.moves is None):
+            raise ValueError("Provide exactly one of board or moves")
+        return self
+
+class AnalysisRequest(BaseModel):
+    positions: List[PositionRequest] = Field(..., max_length=256)
@@ -0,0 +1,27 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from ..game.create_game import GameType
+from ..game.update_game_winner import WinnerEnum
+from ..move.position import Position
+
+class MoveScore(BaseModel):
+    row: int
+    col: int
+    score: int
+
+class PositionAnalysis(BaseModel):
+    game_type: GameType
+    board: str
+    next_player: Optional[str]
+    result: Optional[WinnerEnum]
+    best_move: Optional[Position]
+    score: int
+    moves: List[MoveScore]
+    principal_variation: List[Position]
+    depth: int
+    nodes: int
+
+class AnalysisResponse(BaseModel):
+    results: List[PositionAnalysis]
@@ -1,2 +1,4 @@
+from .compact_game import COMPACT_MEDIA_TYPE, GameCompact
+from .delete_games import GamesDeleted
 from .read_game import GameRead
 from .update_game_winner import UpdateWinnerRequest
\ No newline at end of file
@@ -0,0 +1,23 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from .create_game import GameType
+from .update_game_winner import WinnerEnum
+
+COMPACT_MEDIA_TYPE = 'application/vnd.game-state.compact+json'
+
+
+class GameCompact(BaseModel):
+    """
+    Game state without per-move objects.
+
+    board is the row-major board as 'X', 'O' and '.' characters, and moves holds the cell index
+    (row * cols + col) of every move in play order.
+    """
+    id: str
+    game_type: GameType
+    board: str
+    moves: List[int]
+    next_player: Optional[str]
+    result: Optional[WinnerEnum]
@@ -3,3 +3,5 @@ from enum import Enum
 class GameType(Enum):
     TIC_TAC_TOE = 'TicTacToe'
     CONNECT4 = 'Connect4'
+    GOMOKU = 'Gomoku'
+    CONNECT4_LARGE = 'Connect4Large'
@@ -4,7 +4,7 @@ from uuid import UUID
 from pydantic import BaseModel
 
 class MoveRead(BaseModel):
-    id: UUID
+    ply: int
     game_id: UUID
     player: str
     row: int
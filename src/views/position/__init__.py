@@ -0,0 +1 @@
+from .position_stats import PositionGame, PositionStats
\ No newline at end of file
@@ -0,0 +1,22 @@
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from ..game.create_game import GameType
+from ..game.update_game_winner import WinnerEnum
+
+class PositionGame(BaseModel):
+    game_id: UUID
+    ply: int
+    winner: Optional[WinnerEnum]
+
+class PositionStats(BaseModel):
+    game_type: GameType
+    board: str
+    total_games: int
+    x_wins: int
+    o_wins: int
+    ties: int
+    unfinished: int
+    games: List[PositionGame]